@@ -0,0 +1,198 @@
+"""
+program: slides_anim.py
+
+purpose: For project slideshow.
+
+comments: Play animated GIF, APNG and WebP files inside their slide's hold
+          time. A slide is made from the first frame only; Animation
+          goes on from there, reading the file one frame at a time with
+          ImageSequence on a worker thread and resizing each frame to the
+          slide's size just before it is due. Only a few frames are held
+          at once, so a 1,000-frame animation costs no more memory than a
+          10-frame one.
+
+history:
+-------
+10-18-2026  Animation, frame_duration and the stats functions.
+10-18-2026  Animation.images, for a memory budget.
+"""
+import os
+import queue
+import threading
+import time
+
+from PIL import Image, ImageSequence
+
+import slides_loader
+
+# file name suffixes that may hold more than one frame; the file is opened
+# to find out whether it does
+ANIMATED_SUFFIXES = ('.gif', '.png', '.apng', '.webp')
+
+# browsers show frames of less than 20 ms (often written as 0) for 100 ms
+MIN_DURATION_MS = 20
+DEFAULT_DURATION_MS = 100
+
+
+def may_be_animated(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() in ANIMATED_SUFFIXES
+
+
+def frame_duration(info: dict) -> float:
+    """Return how long a frame is shown, in seconds, from its info dict."""
+    ms = info.get('duration') or 0
+    if ms < MIN_DURATION_MS:
+        ms = DEFAULT_DURATION_MS
+    return ms / 1000
+
+
+class Animation:
+    """Play the frames of an animated image file on a slide.
+
+    The file is opened on a worker thread; if it has only one frame,
+    nothing more happens. Otherwise frames from the second on are decoded
+    in order, resized to size and queued, at most ahead at a time. Each
+    is due at the sum of the durations before it. Frames that are already
+    late are decoded (later frames may depend on them) but not resized.
+    The animation repeats as many times as the file says (its 'loop'
+    value; 0 is forever) or until stop().
+
+    widget's after() (a Tk widget or a slides_sched.SharedTimer) calls a
+    tick when the next frame is due, which passes the latest due frame to
+    show_frame(image) and counts the ones it skipped as dropped. Frames
+    are RGBA.
+    """
+    def __init__(self,
+                 widget: object,
+                 path: str,
+                 size: tuple,
+                 show_frame,
+                 quality: str='balanced',
+                 ahead: int=4,
+                 poll_ms: int=10
+                 ):
+        self.widget = widget
+        self.path = path
+        self.show_frame = show_frame
+        self.poll_ms = poll_ms
+        self.running = True
+        self.frames = 0
+        self.shown = 0
+        self.dropped = 0
+
+        self._frames = queue.Queue(maxsize=ahead)
+        self._stop = threading.Event()
+        self._made_all = False
+        # a frame taken from the queue before it was due
+        self._early = None
+        self._t0 = time.monotonic()
+        threading.Thread(target=self._make,
+                         args=(size, quality),
+                         name='animation',
+                         daemon=True).start()
+        self._timer = self.widget.after(self.poll_ms, self._tick)
+
+    def stop(self) -> None:
+        """End the animation, e.g. because the next slide is due."""
+        self.running = False
+        self._stop.set()
+        if self._timer is not None:
+            self.widget.after_cancel(self._timer)
+            self._timer = None
+
+    def stats(self) -> dict:
+        return {'frames': self.frames, 'shown': self.shown, 'dropped': self.dropped}
+
+    def images(self) -> list:
+        """Return the resized frames waiting to be shown, for a memory budget."""
+        with self._frames.mutex:
+            frames = [frame for due, frame in self._frames.queue]
+        early = self._early
+        if early is not None:
+            frames.append(early[1])
+        return frames
+
+    def _make(self, size: tuple, quality: str) -> None:
+        try:
+            with Image.open(self.path) as im:
+                if not getattr(im, 'is_animated', False):
+                    return
+                loops = im.info.get('loop', 1)
+                due = 0.0
+                played = 0
+                while not self._stop.is_set() and (loops == 0 or played < loops):
+                    for i, frame in enumerate(ImageSequence.Iterator(im)):
+                        if self._stop.is_set():
+                            return
+                        duration = frame_duration(frame.info)
+                        # the first frame of the first pass is the slide itself
+                        if played or i:
+                            self._put(due, duration, frame, size, quality)
+                        due += duration
+                    played += 1
+        except Exception as e:
+            print(f'error reading animation: {str(e)}')
+        finally:
+            self._made_all = True
+
+    def _put(self, due: float, duration: float, frame: Image.Image, size: tuple, quality: str) -> None:
+        self.frames += 1
+        if due + duration < time.monotonic() - self._t0:
+            self.dropped += 1
+            return
+
+        resized = slides_loader.decode_to_size(frame.convert('RGBA'), size, quality)
+        while not self._stop.is_set():
+            try:
+                self._frames.put((due, resized), timeout=0.05)
+                return
+            except queue.Full:
+                continue
+
+    def _tick(self) -> None:
+        self._timer = None
+        if not self.running:
+            return
+
+        now = time.monotonic() - self._t0
+        # made_all is read first: once it is set, nothing more is queued
+        made_all = self._made_all
+        latest = None
+        while True:
+            if self._early is None:
+                try:
+                    self._early = self._frames.get_nowait()
+                except queue.Empty:
+                    break
+            if self._early[0] > now:
+                break
+            if latest is not None:
+                self.dropped += 1
+            latest = self._early
+            self._early = None
+
+        if latest is not None:
+            self.shown += 1
+            self.show_frame(latest[1])
+
+        if self._early is not None:
+            wait_ms = max(1, round((self._early[0] - (time.monotonic() - self._t0)) * 1000))
+        elif made_all:
+            self.running = False
+            return
+        else:
+            wait_ms = self.poll_ms
+        self._timer = self.widget.after(wait_ms, self._tick)
+
+
+def add_stats(totals: dict, stats: dict) -> None:
+    """Add one Animation's stats() to totals, which starts as an empty dict."""
+    totals['count'] = totals.get('count', 0) + 1
+    for key in ('frames', 'shown', 'dropped'):
+        totals[key] = totals.get(key, 0) + stats[key]
+
+
+def format_stats(stats: dict) -> str:
+    """Return a one-line summary of the totals made by add_stats."""
+    return (f"{stats['count']} animations, {stats['shown']} of {stats['frames']} frames shown, "
+            f"{stats['dropped']} dropped")
@@ -0,0 +1,483 @@
+"""
+program: slides_bench.py
+
+purpose: For project slideshow.
+
+comments: Benchmark for the decode, resize and display path of
+          slides_canvas and slides_plot. Makes a set of synthetic images,
+          plays them through the same loader, scheduler and display steps
+          the applications use, and prints the results as JSON, so runs on
+          different commits can be compared.
+
+          Each application is measured in its own child process, so the
+          peak RSS isn't mixed up with the image generation or the other
+          application.
+
+          --mode headless needs no display: slides_canvas skips the
+          PhotoImage and canvas steps, and slides_plot draws with the Agg
+          backend. --mode tk uses a real Tk root and TkAgg, so it needs a
+          display; under a virtual X server, run it with
+              xvfb-run python slides_bench.py --mode tk
+
+          A file that fails to decode is left out, as in the applications,
+          and counted in 'errors'; the run exits with status 1 if any did,
+          since its timings would not be comparable.
+
+          Like the applications, run it from the project directory:
+          slides_loader looks for ../canvas/canvas_ui.py.
+
+          example:
+              python slides_bench.py --count 40 --size 4000x3000 --format jpeg
+                                     --output bench_output.txt
+
+history:
+-------
+10-18-2026  Time to first slide, transition latency, decode CPU, peak RSS.
+10-18-2026  Add --plot-render, for slides_plot's fast_render.
+10-18-2026  Count files that fail to decode; the run fails if any do.
+            Classic plot rendering opens files through ImageSource, as
+            slides_plot does.
+"""
+import argparse
+import heapq
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+
+from PIL import Image
+
+import slides_loader
+import slides_sched
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# format name: (PIL mode, file suffix)
+FORMATS = {'jpeg': ('RGB', '.jpg'),
+           'png': ('RGB', '.png'),
+           'rgba': ('RGBA', '.png'),
+           'png16': ('I;16', '.png')}
+
+
+def make_image(mode: str, size: tuple, seed: int) -> Image.Image:
+    """Return a synthetic photo-like image: gradients with some noise.
+
+    seed varies the picture, so that the files don't all compress alike.
+    """
+    grad = Image.linear_gradient('L').resize(size)
+    noise = Image.effect_noise(size, 24 + seed % 16)
+    bands = [Image.blend(grad.rotate(90 * ((seed + k) % 4)).resize(size), noise, 0.3)
+             for k in range(3)]
+    im = Image.merge('RGB', bands)
+
+    if mode == 'RGBA':
+        im.putalpha(grad.transpose(Image.Transpose.FLIP_LEFT_RIGHT))
+    elif mode == 'I;16':
+        im = im.convert('L').convert('I').point(lambda v: v * 257).convert('I;16')
+
+    return im
+
+
+def make_image_set(directory: str,
+                   count: int,
+                   size: tuple,
+                   fmt: str
+                   ) -> list:
+    """Write count images to directory, unless they are there already.
+
+    Returns the list of paths.
+    """
+    mode, suffix = FORMATS[fmt]
+    os.makedirs(directory, exist_ok=True)
+
+    paths = []
+    for n in range(count):
+        path = os.path.join(directory, f'bench_{fmt}_{size[0]}x{size[1]}_{n:05d}{suffix}')
+        if not os.path.exists(path):
+            im = make_image(mode, size, n)
+            if fmt == 'jpeg':
+                im.save(path, quality=90)
+            else:
+                im.save(path, compress_level=1)
+        paths.append(path)
+
+    return paths
+
+
+class HeadlessLoop:
+    """Stands in for Tk's after() and mainloop when there is no display.
+
+    idle, if given, is called while waiting for the next timer (e.g.
+    root.update, so that a real Tk root stays responsive).
+    """
+    def __init__(self, idle=None):
+        self.idle = idle
+        self._timers = []
+        self._cancelled = set()
+        self._seq = 0
+
+    def after(self, ms: int, func, *args) -> int:
+        self._seq += 1
+        heapq.heappush(self._timers, (time.monotonic() + ms / 1000, self._seq, func, args))
+        return self._seq
+
+    def after_cancel(self, timer_id: int) -> None:
+        self._cancelled.add(timer_id)
+
+    def run_until(self, done) -> None:
+        """Run timers until done() is true or none are left."""
+        while self._timers and not done():
+            due, seq, func, args = heapq.heappop(self._timers)
+            if seq in self._cancelled:
+                self._cancelled.discard(seq)
+                continue
+
+            while time.monotonic() < due:
+                if self.idle is not None:
+                    self.idle()
+                time.sleep(min(0.001, max(0.0, due - time.monotonic())))
+            func(*args)
+
+
+def summarize(values) -> dict:
+    """Return mean, p50, p95 and max of a list of seconds, in ms."""
+    values = sorted(values)
+    if not values:
+        return {'n': 0, 'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+
+    num = len(values)
+
+    def pct(p):
+        return values[min(num - 1, math.ceil(p * num) - 1)] * 1000
+
+    return {'n': num,
+            'mean': sum(values) / num * 1000,
+            'p50': pct(0.50),
+            'p95': pct(0.95),
+            'max': values[-1] * 1000}
+
+
+def peak_rss_mb() -> float | None:
+    """Return the peak resident set size of this process, in MB."""
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        return peak / 2**20
+    return peak / 2**10
+
+
+def bench_canvas(paths: list, args: argparse.Namespace) -> dict:
+    """Play paths the way slides_canvas does, and time it.
+
+    Slides are decoded by a slides_loader.Prefetcher in a window around
+    the current one, and shown by a SlideScheduler. In tk mode each slide
+    becomes a PhotoImage swapped between two canvas items.
+    """
+    viewport = {'w': args.viewport[0], 'h': args.viewport[1]}
+    decode_cpu = []
+
+    load_slide = slides_loader.load_slide
+
+    def timed_load(*a, **kw):
+        start = time.thread_time()
+        im = load_slide(*a, **kw)
+        decode_cpu.append(time.thread_time() - start)
+        return im
+
+    # the prefetch workers look load_slide up in the module
+    slides_loader.load_slide = timed_load
+
+    if args.mode == 'tk':
+        import tkinter as tk
+        from PIL import ImageTk
+
+        root = tk.Tk()
+        canv = tk.Canvas(root, width=viewport['w'], height=viewport['h'])
+        canv.pack()
+        items = [canv.create_image(viewport['w'] / 2, viewport['h'] / 2, state=tk.HIDDEN)
+                 for n in range(2)]
+        root.update()
+        loop = HeadlessLoop(idle=root.update)
+        to_display = ImageTk.PhotoImage
+    else:
+        loop = HeadlessLoop()
+        to_display = None
+
+    prefetch = slides_loader.Prefetcher(args.workers, args.queue, quality=args.quality)
+    slides = {}
+    bad = set()
+    state = {'window': [], 'first': None}
+    transitions = []
+
+    def poll():
+        for n, im in prefetch.results():
+            if im is None:
+                bad.add(n)
+            elif n in state['window']:
+                slides[n] = im if to_display is None else to_display(im)
+        loop.after(args.poll_ms, poll)
+
+    def show(n):
+        start = time.perf_counter()
+        if n in bad:
+            return slides_sched.SKIP
+        window = slides_loader.window_range(n, len(paths), args.ahead, args.behind)
+        state['window'] = window
+        prefetch.retain(window)
+        for k in [k for k in slides if k not in window]:
+            del slides[k]
+        for priority, k in enumerate(window):
+            if k not in slides and k not in bad:
+                prefetch.submit(k, paths[k], viewport, priority)
+
+        if prefetch.pending(n):
+            return False
+        if n in bad:
+            return slides_sched.SKIP
+
+        if to_display is not None:
+            canv.itemconfigure(items[1], image=slides.get(n, ''), state=tk.NORMAL)
+            canv.itemconfigure(items[0], state=tk.HIDDEN)
+            items.reverse()
+            root.update_idletasks()
+
+        now = time.perf_counter()
+        transitions.append(now - start)
+        if state['first'] is None:
+            state['first'] = now - t_start
+
+        return True
+
+    sched = slides_sched.SlideScheduler(loop, show, len(paths), args.delay, retry_ms=1)
+
+    cpu_start = time.process_time()
+    t_start = time.perf_counter()
+    loop.after(args.poll_ms, poll)
+    sched.play(0)
+    loop.run_until(lambda: sched.status == 'done')
+    wall = time.perf_counter() - t_start
+    cpu = time.process_time() - cpu_start
+
+    slides_loader.load_slide = load_slide
+    if args.mode == 'tk':
+        root.destroy()
+
+    return results(args, state['first'], transitions, sched, decode_cpu, cpu, wall, len(bad))
+
+
+def bench_plot(paths: list, args: argparse.Namespace) -> dict:
+    """Play paths the way slides_plot does, and time it.
+
+    With --plot-render classic, each slide's file is opened and decoded
+    through a slides_loader.ImageSource when it comes up, and the figure
+    is cleared, the full-size image shown with imshow and the title set;
+    with fast (slides_plot.fast_render), the slide is loaded at the
+    figure's size and drawn by slides_mpl.render_image. Here the figure is
+    drawn at once (draw) rather than later (draw_idle), so that drawing is
+    part of the transition time.
+    """
+    import matplotlib
+    if args.mode == 'headless':
+        matplotlib.use('Agg')
+    else:
+        matplotlib.use('TkAgg')
+    import matplotlib.pyplot as plt
+    import slides_mpl
+
+    fig = plt.figure(figsize=[9.6, 5.0])
+    if args.mode == 'tk':
+        fig.show()
+        loop = HeadlessLoop(idle=fig.canvas.flush_events)
+    else:
+        loop = HeadlessLoop()
+
+    if args.plot_render == 'fast':
+        view = slides_mpl.init_fast_render(fig)
+        width, height = fig.get_size_inches() * fig.dpi
+        fig_vp = {'w': int(width), 'h': int(height)}
+
+    decode_cpu = []
+    state = {'first': None, 'errors': 0}
+    transitions = []
+    image_source = slides_loader.ImageSource()
+
+    cpu_start = time.process_time()
+    t_start = time.perf_counter()
+
+    def show(n):
+        start = time.perf_counter()
+        text = 'image ' + str(n + 1) + ': ' + os.path.basename(paths[n])
+
+        cpu = time.thread_time()
+        if args.plot_render == 'fast':
+            im = slides_loader.load_slide(paths[n], fig_vp, quality=args.quality)
+        else:
+            im = image_source.load(paths[n])
+            if n > 0:
+                image_source.release(paths[n - 1])
+            if n + 1 < len(paths):
+                image_source.open(paths[n + 1])
+        decode_cpu.append(time.thread_time() - cpu)
+        if im is None:
+            state['errors'] += 1
+            return slides_sched.SKIP
+
+        if args.plot_render == 'fast':
+            slides_mpl.render_image(view, im, text, draw_now=True)
+        else:
+            plt.figure(fig.number)
+            plt.clf()
+            plt.imshow(im)
+            plt.axis('off')
+            plt.title(text)
+            fig.canvas.draw()
+
+        now = time.perf_counter()
+        transitions.append(now - start)
+        if state['first'] is None:
+            state['first'] = now - t_start
+
+        return True
+
+    sched = slides_sched.SlideScheduler(loop, show, len(paths), args.delay, retry_ms=1)
+    sched.play(0)
+    loop.run_until(lambda: sched.status == 'done')
+    wall = time.perf_counter() - t_start
+    cpu = time.process_time() - cpu_start
+
+    image_source.close()
+    plt.close(fig)
+
+    return results(args, state['first'], transitions, sched, decode_cpu, cpu, wall, state['errors'])
+
+
+def results(args: argparse.Namespace,
+            first: float | None,
+            transitions: list,
+            sched: object,
+            decode_cpu: list,
+            cpu: float,
+            wall: float,
+            errors: int
+            ) -> dict:
+    stats = sched.stats()
+    return {'app': args.app,
+            'mode': args.mode,
+            'format': args.format,
+            'count': args.count,
+            'size': args.size,
+            'viewport': args.viewport,
+            'delay_s': args.delay,
+            'plot_render': args.plot_render,
+            'time_to_first_slide_ms': None if first is None else first * 1000,
+            'transition_ms': summarize(transitions),
+            'lateness_ms': summarize(sched._lateness),
+            'dropped': stats['dropped'],
+            'errors': errors,
+            'decode_cpu_s': sum(decode_cpu),
+            'decodes': len(decode_cpu),
+            'process_cpu_s': cpu,
+            'wall_s': wall,
+            'peak_rss_mb': peak_rss_mb()}
+
+
+def git_commit() -> str | None:
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                             cwd=os.path.dirname(os.path.abspath(__file__)),
+                             capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def size_arg(text: str) -> list:
+    width, height = text.lower().split('x')
+    return [int(width), int(height)]
+
+
+def parse_args(argv: list) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Benchmark the slideshow display path.')
+    parser.add_argument('--app', choices=['canvas', 'plot', 'both'], default='both')
+    parser.add_argument('--mode', choices=['headless', 'tk'], default='headless')
+    parser.add_argument('--format', choices=sorted(FORMATS), default='jpeg')
+    parser.add_argument('--count', type=int, default=20)
+    parser.add_argument('--size', type=size_arg, default=[3000, 2000],
+                        help='image size, WxH')
+    parser.add_argument('--viewport', type=size_arg, default=[400, 300],
+                        help='slides_canvas viewport, WxH')
+    parser.add_argument('--delay', type=float, default=0.05,
+                        help='hold time per slide, in seconds')
+    parser.add_argument('--plot-render', choices=['fast', 'classic'], default='fast')
+    parser.add_argument('--quality', choices=sorted(slides_loader.RESAMPLE), default='balanced')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--queue', type=int, default=8)
+    parser.add_argument('--ahead', type=int, default=2)
+    parser.add_argument('--behind', type=int, default=1)
+    parser.add_argument('--poll-ms', type=int, default=5)
+    parser.add_argument('--dir', default='bench_images',
+                        help='where to write the synthetic images')
+    parser.add_argument('--output', help='append the JSON results to this file')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+
+    return parser.parse_args(argv)
+
+
+def without_app(argv: list) -> list:
+    """Return argv without its --app option."""
+    out = []
+    skip = False
+    for arg in argv:
+        if skip:
+            skip = False
+        elif arg == '--app':
+            skip = True
+        elif not arg.startswith('--app='):
+            out.append(arg)
+
+    return out
+
+
+def main(argv: list) -> None:
+    args = parse_args(argv)
+    paths = make_image_set(args.dir, args.count, tuple(args.size), args.format)
+
+    if args.child:
+        bench = bench_canvas if args.app == 'canvas' else bench_plot
+        print(json.dumps(bench(paths, args)))
+        return
+
+    apps = ['canvas', 'plot'] if args.app == 'both' else [args.app]
+    report = {'commit': git_commit(), 'python': sys.version.split()[0], 'runs': []}
+    for app in apps:
+        child_argv = without_app(argv)
+        out = subprocess.run([sys.executable, __file__, *child_argv, '--app', app, '--child'],
+                             capture_output=True, text=True)
+        if out.returncode != 0:
+            print(out.stderr, file=sys.stderr)
+            report['runs'].append({'app': app, 'error': out.stderr.strip().splitlines()[-1:]})
+            continue
+        report['runs'].append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'a') as f:
+            f.write(text + '\n')
+
+    failed = [run['app'] for run in report['runs'] if 'error' in run or run['errors']]
+    if failed:
+        print(f"error: decoding failed in {', '.join(failed)}; the timings are not valid",
+              file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
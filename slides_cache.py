@@ -0,0 +1,287 @@
+"""
+program: slides_cache.py
+
+purpose: For project slideshow.
+
+comments: Keeps slides that are ready to display, so that restarting or
+          looping a show, or opening the same files again, doesn't decode
+          and resize them again: SlideCache in memory, and DiskCache in a
+          directory that lasts from one run to the next.
+
+history:
+-------
+10-18-2026  SlideCache: in-memory LRU cache with a byte budget.
+10-18-2026  DiskCache: resized slides saved as raw pixels between runs.
+10-18-2026  SlideCache.images and set_max_bytes, for a memory budget.
+10-18-2026  DiskCache.put scales 16-bit slides to 8 bits (to_8bit) instead of
+            clipping them.
+10-18-2026  The cache keys include the resampling quality.
+"""
+from collections import OrderedDict
+import hashlib
+import os
+import struct
+import threading
+
+from PIL import Image
+
+# bytes per pixel for the PIL modes we expect to see; others count as 4
+MODE_BYTES = {'1': 1, 'L': 1, 'P': 1, 'I;16': 2, 'LA': 2,
+              'RGB': 3, 'YCbCr': 3, 'RGBA': 4, 'CMYK': 4, 'I': 4, 'F': 4}
+# 16-bit modes, and the 32-bit 'I' that slides_large.reduce_image makes of
+# them; their values go up to 65535
+WIDE_MODES = ('I', 'I;16', 'I;16L', 'I;16B', 'I;16N')
+
+
+def image_bytes(im: object) -> int:
+    """Return the approximate size of a decoded PIL image's pixel data."""
+    return im.width * im.height * MODE_BYTES.get(im.mode, 4)
+
+
+def to_8bit(im: object) -> object:
+    """Return im scaled down to 8-bit L if its mode is in WIDE_MODES, else im.
+
+    convert('L') or convert('RGB') would clip the values at 255 instead,
+    leaving a 16-bit image almost white.
+    """
+    if im.mode not in WIDE_MODES:
+        return im
+    if im.mode != 'I':
+        im = im.convert('I')
+    return im.point(lambda v: v / 256).convert('L')
+
+
+def file_key(path: str, viewport: dict | None, quality: str | None=None) -> tuple | None:
+    """Return the cache key for path shown in viewport.
+
+    The key changes when the file is modified or replaced (mtime, size),
+    the viewport changes size or the image was resized at another quality
+    (see slides_loader.RESAMPLE). viewport None means the full-size image.
+    Returns None if the file can't be read.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+
+    if viewport is None:
+        vp_size = (0, 0)
+    else:
+        vp_size = (viewport['w'], viewport['h'])
+
+    return (path, st.st_mtime_ns, st.st_size) + vp_size + (quality,)
+
+
+class SlideCache:
+    """Least-recently-used cache of display-ready PIL images.
+
+    Entries are evicted, oldest use first, when the total size of the
+    images held goes over max_bytes. An image bigger than max_bytes on its
+    own is not kept. Safe to use from the prefetch worker threads.
+    """
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, path: str, viewport: dict | None, quality: str | None=None) -> object:
+        """Return the cached image for path in viewport at quality, or None."""
+        key = file_key(path, viewport, quality)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, path: str, viewport: dict | None, im: object, quality: str | None=None) -> None:
+        key = file_key(path, viewport, quality)
+        size = image_bytes(im)
+        if key is None or size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= old[1]
+
+            self._entries[key] = (im, size)
+            self.nbytes += size
+            self._trim()
+
+    def images(self) -> list:
+        """Return the images held, oldest use first."""
+        with self._lock:
+            return [im for im, size in self._entries.values()]
+
+    def set_max_bytes(self, max_bytes: int) -> None:
+        """Change the limit, evicting the oldest entries if it has gone down."""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._trim()
+
+    def _trim(self) -> None:
+        while self.nbytes > self.max_bytes:
+            old_key, old = self._entries.popitem(last=False)
+            self.nbytes -= old[1]
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'entries': len(self._entries),
+                    'bytes': self.nbytes,
+                    'max_bytes': self.max_bytes,
+                    'hits': self.hits,
+                    'misses': self.misses,
+                    'evictions': self.evictions}
+
+
+class DiskCache:
+    """Resized slides kept as files in directory, so later runs start warm.
+
+    Each file holds a short header (mode, width, height) and the raw pixel
+    data, which loads with one read and no decoding. The file name is a hash
+    of the cache key (see file_key), so an edited file, a different
+    viewport size or another quality simply misses; stale files are removed by trim().
+
+    Files are touched when read, and trim() deletes the least recently used
+    until the directory is back under max_bytes. Safe to use from the
+    prefetch worker threads.
+    """
+    header = struct.Struct('<4s8sII')
+    magic = b'SLD1'
+    suffix = '.slide'
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.removed = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        self.nbytes = sum(entry.stat().st_size for entry in self._scan())
+
+    def _scan(self):
+        with os.scandir(self.directory) as it:
+            return [entry for entry in it if entry.name.endswith(self.suffix)]
+
+    def _filename(self, key: tuple) -> str:
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.directory, digest + self.suffix)
+
+    def get(self, path: str, viewport: dict, quality: str | None=None) -> object:
+        """Return the saved slide for path in viewport at quality, or None."""
+        key = file_key(path, viewport, quality)
+        if key is None:
+            self.misses += 1
+            return None
+
+        fname = self._filename(key)
+        try:
+            with open(fname, 'rb') as f:
+                data = f.read()
+            magic, mode, width, height = self.header.unpack_from(data)
+            mode = mode.rstrip(b'\0').decode()
+            im = Image.frombytes(mode, (width, height), data[self.header.size:])
+            os.utime(fname)
+        except (OSError, ValueError, struct.error):
+            self.misses += 1
+            return None
+
+        if magic != self.magic:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return im
+
+    def put(self, path: str, viewport: dict, im: object, quality: str | None=None) -> None:
+        key = file_key(path, viewport, quality)
+        if key is None:
+            return
+
+        im = to_8bit(im)
+        if im.mode not in ('L', 'LA', 'RGB', 'RGBA'):
+            if im.mode == 'P' and 'transparency' in im.info:
+                im = im.convert('RGBA')
+            else:
+                im = im.convert('RGB')
+
+        fname = self._filename(key)
+        tmpname = f'{fname}.{threading.get_ident()}.tmp'
+        data = self.header.pack(self.magic, im.mode.encode(), im.width, im.height) + im.tobytes()
+        try:
+            with open(tmpname, 'wb') as f:
+                f.write(data)
+            os.replace(tmpname, fname)
+        except OSError as e:
+            print(f'error writing slide cache: {str(e)}')
+            return
+
+        with self._lock:
+            self.nbytes += len(data)
+            self.writes += 1
+            over = self.nbytes > self.max_bytes
+
+        if over:
+            self.trim()
+
+    def trim(self) -> None:
+        """Delete least recently used files until the cache is under max_bytes.
+
+        Trims to 90% of max_bytes so that the next few writes don't trim again.
+        """
+        with self._lock:
+            entries = sorted(self._scan(), key=lambda entry: entry.stat().st_mtime)
+            total = sum(entry.stat().st_size for entry in entries)
+            for entry in entries:
+                if total <= self.max_bytes * 0.9:
+                    break
+                try:
+                    size = entry.stat().st_size
+                    os.remove(entry.path)
+                except OSError:
+                    continue
+                total -= size
+                self.removed += 1
+            self.nbytes = total
+
+    def stats(self) -> dict:
+        return {'bytes': self.nbytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'writes': self.writes,
+                'removed': self.removed}
+
+
+def format_disk_stats(stats: dict) -> str:
+    """Return a one-line summary of DiskCache.stats()."""
+    return (f"{stats['bytes'] / 2**20:.1f} of {stats['max_bytes'] / 2**20:.0f} MB; "
+            f"{stats['hits']} hits, {stats['misses']} misses, "
+            f"{stats['writes']} writes, {stats['removed']} removed")
+
+
+def format_stats(stats: dict) -> str:
+    """Return a one-line summary of SlideCache.stats()."""
+    return (f"{stats['entries']} slides, {stats['bytes'] / 2**20:.1f} of "
+            f"{stats['max_bytes'] / 2**20:.0f} MB; {stats['hits']} hits, "
+            f"{stats['misses']} misses, {stats['evictions']} evictions")
@@ -21,16 +21,100 @@ history:
 07-21-2026  Add conditions to pause/resume. Remove flag for cursor 'in' window.
 07-22-2026  Disable mouse-button-1 in the canvas (read_but1) until we think of
             a use for it. More efficient calc of total UI height.
+10-18-2026  Lazy, windowed decoding: use_canvas no longer decodes the whole
+            selection up front. Each slide is decoded when the show nears
+            it, and dropped when it falls out of the window set in
+            slides_canvas_cfg.
+10-18-2026  Decode and resize on a pool of prefetch threads. Only the
+            PhotoImage and the canvas item update are done on the Tk thread,
+            from poll_prefetch.
+10-18-2026  Run the show from after() timers (slides_sched) instead of
+            time.sleep, so pause, resume and the delay entry respond while
+            a slide is on screen.
+10-18-2026  Slides are due at fixed times from the start of the show;
+            timing stats are printed when it ends.
+10-18-2026  The canvas holds two slide items, front and back, whose images
+            are swapped, instead of one hidden item per slide.
+10-18-2026  Keep the show in a slides_state.Slideshow instead of the
+            images_opened / images_selected / image_objects globals. Add
+            keyboard seeking: Ctrl-Right/Left for next/previous,
+            Ctrl-Home/End for first/last, Ctrl-g to go to a slide number.
+10-18-2026  Resized slides are kept in an LRU cache (slides_cache), so a
+            restart, a loop or re-opening the same files doesn't decode
+            them again.
+10-18-2026  Resized slides are also saved to a disk cache, so the next run
+            of the same files starts without decoding them.
+10-18-2026  Slides are decoded at the viewport size (JPEG draft mode and
+            reduce) with the resampling set by cfg.resample_quality.
+10-18-2026  Trace spans for PhotoImage creation and slide display; set
+            SLIDES_TRACE=trace.json to record them (see slides_trace).
+10-18-2026  Add Open Folder: plays the images in a folder, optionally with
+            its subfolders, starting on the first one found while a
+            slides_source.FolderScan adds the rest in the background.
+10-18-2026  The playlist is a compact slides_playlist.Playlist; add
+            cfg.shuffle and cfg.repeat.
+10-18-2026  Save the playlist, with image metadata, with Ctrl-s; a saved
+            playlist (.slides) opens through Open Files without opening
+            the images.
+10-18-2026  Image catalog (slides_catalog): Ctrl-i indexes a folder in the
+            background, Ctrl-f plays the images matching a query.
+10-18-2026  add_image adds files to a running show instead of rebuilding
+            it: Open Files appends to the end, Ctrl-Insert puts files after
+            the slide on screen and Ctrl-Delete removes that slide. The
+            position and the decoded slides are kept.
+10-18-2026  Follow window resizes: the slide on screen is rescaled quickly
+            while the edge is dragged, then, once the resizing stops, the
+            window is decoded again at the new size in the background.
+10-18-2026  Optional crossfade, slide or wipe transitions (cfg.transition),
+            made on a thread by slides_transition and shown in an overlay
+            item; the frame rate achieved is printed with the timing stats.
+10-18-2026  Animated GIF, APNG and WebP slides play (cfg.animate): frames
+            are streamed from the file by slides_anim while the slide is on
+            screen, instead of only the first one being shown.
+10-18-2026  Very large images are decoded in bands or at reduced resolution
+            (slides_large). Pan and zoom: the mouse wheel zooms the slide on
+            screen about the pointer and dragging pans it; only the part in
+            view is decoded, at the resolution shown. Zooming pauses the
+            show; Escape goes back to the whole slide.
+10-18-2026  Optional memory ceiling (cfg.memory_mb): the bytes of decoded
+            slides, PhotoImages and the slide cache are added up by
+            slides_memory, and over the ceiling the cache and then the
+            window of decoded slides shrink. The figures are shown in the
+            caption and printed with the timing stats.
+10-18-2026  Files that can't be read are left out of the show instead of
+            being shown as an empty slide.
+10-18-2026  A saved playlist is opened without checking its files; saving
+            copies the playlist first.
+10-18-2026  Zooming works on images too large for Pillow's default limit.
+10-18-2026  front_photo keeps the slide on screen up when a seek, a resize or an
+            edit drops it from slideshow.slides.
+10-18-2026  The memory budget counts the animation's PhotoImage and queued frames,
+            and each new show starts from the full window again.
 """
 import tkinter as tk
-from tkinter import ttk, filedialog
+from tkinter import ttk, filedialog, messagebox, simpledialog
 from importlib.machinery import SourceFileLoader
-import time
+import queue
+import threading
 import tkinter.font as tkfont
 
 from ttkthemes import ThemedTk
 from PIL import Image, ImageTk
 
+import slides_canvas_cfg as cfg
+import slides_anim
+import slides_cache
+import slides_catalog
+import slides_large
+import slides_loader
+import slides_memory
+import slides_playlist
+import slides_sched
+import slides_source
+import slides_state
+import slides_trace as trace
+import slides_transition
+
 sttk = SourceFileLoader("styles_ttk", "../styles/styles_ttk.py").load_module()
 cnv_ui = SourceFileLoader("cnv", "../canvas/canvas_ui.py").load_module()
 sel = SourceFileLoader("ui", "../utilities/tool_classes.py").load_module()
@@ -47,201 +131,971 @@ helv12b = tkfont.Font(family='Helvetica', size=12, weight='bold')
 canv_config_flag = False
 
 def select_image_file(canv: object) -> None:
-    if run_status is True:
+    if slideshow is None or slideshow.status != 'paused':
         file_path = filedialog.askopenfilenames(title="Select Image File",
                                                 initialdir="images",
                                                 filetypes=[("Png files", "*.png"),
                                                            ("Jpeg files", "jpg"),
+                                                           ("Playlists", "*" + slides_playlist.PLAYLIST_SUFFIX),
                                                            ("All files", "*.*")]
                                                 )
-        if file_path:
+        if len(file_path) == 1 and file_path[0].endswith(slides_playlist.PLAYLIST_SUFFIX):
+            open_playlist(canv, file_path[0])
+        elif file_path:
             add_image(canv, file_path)
         # do we need this?
         # window_reset.focus_set()
 
 
+def open_playlist(canv: object, path: str) -> None:
+    """Play a playlist saved by save_show."""
+    try:
+        playlist = slides_playlist.load_playlist(path, check=False)
+    except (OSError, ValueError) as e:
+        print(f'error opening playlist: {str(e)}')
+        return
+
+    use_canvas(canv, playlist)
+
+
+def save_show(ev=None) -> None:
+    """Save the show's playlist, with the size and format of each image.
+
+    The playlist is copied, and images that haven't been probed yet, or
+    have changed since, are read on a background thread.
+    """
+    if slideshow is None or not len(slideshow):
+        return
+
+    path = filedialog.asksaveasfilename(title="Save Playlist",
+                                        initialdir="images",
+                                        defaultextension=slides_playlist.PLAYLIST_SUFFIX,
+                                        filetypes=[("Playlists", "*" + slides_playlist.PLAYLIST_SUFFIX)])
+    if path:
+        slides_playlist.save_in_background(slideshow.paths, path)
+
+
+def index_folder(ev=None) -> None:
+    """Add a folder's images to the catalog, on a background thread."""
+    folder = filedialog.askdirectory(title="Select Folder to Index", initialdir="images")
+    if not folder:
+        return
+
+    recursive = messagebox.askyesno('Index Folder', 'Include subfolders?')
+    indexer = slides_catalog.Indexer(cfg.catalog_file, folder, recursive, cfg.folder_patterns)
+    root.after(500, poll_indexer, indexer)
+
+
+def poll_indexer(indexer: object) -> None:
+    if indexer.done:
+        print('catalog: ' + indexer.summary())
+    else:
+        root.after(500, poll_indexer, indexer)
+
+
+def find_slides(ev=None) -> None:
+    """Ask for a catalog query, and play the images that match.
+
+    Uses module variables:
+        catalog -- connection to the catalog database, opened when first used
+    """
+    global catalog
+
+    query = slides_catalog.QueryDialog(root, 'Find Images').result
+    if query is None:
+        return
+
+    if catalog is None:
+        catalog = slides_catalog.connect(cfg.catalog_file)
+    playlist = slides_catalog.find(catalog, **query)
+    print(f'{len(playlist)} images found')
+    if len(playlist):
+        use_canvas(canv_1, playlist)
+
+
+def select_folder(canv: object) -> None:
+    """Play the images in a folder, starting as soon as the first is found.
+
+    Uses module variables:
+        folder_scan -- the FolderScan adding files to the show
+    """
+    global folder_scan
+
+    if slideshow is not None and slideshow.status == 'paused':
+        return
+
+    folder = filedialog.askdirectory(title="Select Image Folder", initialdir="images")
+    if not folder:
+        return
+
+    recursive = messagebox.askyesno('Open Folder', 'Include subfolders?')
+    use_canvas(canv, (), more_coming=True)
+    folder_scan = slides_source.FolderScan(folder, recursive, cfg.folder_patterns)
+    canv.after(cfg.scan_poll_ms, poll_scan, canv, folder_scan)
+
+
+def poll_scan(canv: object, scan: object) -> None:
+    """Add the files scan has found to the show, until the scan is done."""
+    if scan is not folder_scan:
+        return
+
+    paths = scan.take()
+    if paths or scan.finished:
+        slideshow.extend(paths, more_coming=not scan.finished)
+
+    if scan.finished:
+        print(f'{scan.found} images found in {scan.folder}')
+    else:
+        canv.after(cfg.scan_poll_ms, poll_scan, canv, scan)
+
+
 def use_canvas(canv: object,
                fpath: tuple | str,
-               startnum: int=0
+               startnum: int=0,
+               more_coming: bool=False
                ) -> None:
-    """Create a PIL PhotoImage for each file in a list of paths.
+    """Set up a show for a list of image paths, and start it.
+
+    more_coming says that paths will be added as the show plays (see
+    Slideshow.extend).
+
+    With cfg.lazy_decode, no file is opened here: slides are decoded by the
+    prefetch workers as the show gets near them.
 
     Uses module variables:
-        im_tk
-        image_objects
-        images_opened
+        slideshow -- the Slideshow being displayed
+        folder_scan
+        window_limit -- starts again from the full window; enforce_budget
+                        shortens it if the new show's slides need it
 
     Calls:
         prep_canvas
+        decode_all
         display_slides
     """
-    # if the last image should persist, enable this line:
-    global im_tk
-    global image_objects
-    global images_opened
+    global slideshow
+    global folder_scan
+    global window_limit
+
+    if folder_scan is not None:
+        folder_scan.stop()
+        folder_scan = None
+    prefetch.cancel()
+    if slideshow is not None and slideshow.sched is not None:
+        slideshow.sched.stop()
+    stop_animation()
 
-    image_objects = []
-    images_opened = []
     if isinstance(fpath, str):
         fpath = (fpath, )
+    slideshow = slides_state.Slideshow(fpath, cfg.shuffle)
+    window_limit = None
+
+    prep_canvas(canv, startnum)
 
-    for n, item in enumerate(fpath):
-            try:
-                with Image.open(item) as im:
-                    imsize = cnv_ui.init_image_size(im, viewport)
-                    im_resize = im.resize((imsize['w'], imsize['h']))
+    if not cfg.lazy_decode:
+        decode_all(canv)
 
-                    im_tk = ImageTk.PhotoImage(im_resize)
+    display_slides(canv, startnum, more_coming)
 
-                    image_objects.append(im_tk)
-                    images_opened.append(im.filename)
-            except Exception as e:
-                print(f'error opening image: {str(e)}')
 
-    prep_canvas(canv, startnum)
+def prep_canvas(canv: object, startnum: int) -> None:
+    """Prepare the Canvas for image display by creating the two slide items.
 
-    display_slides(canv, fpath, startnum)
+    One item shows the current slide while the other, hidden, is given the
+    next slide's image as soon as it is decoded. A transition swaps them,
+    so it costs the same however long the playlist is.
 
+    A third item, on top, shows the frames of a transition.
 
-def prep_canvas(canv: object, startnum: int) -> None:
-    """Prepare the Canvas for image display by creating the list of objects.
     Uses these module variables:
-        image_objects
-        images_opened
-        images_selected
+        slide_items -- [front item, back item]
+        back_slide -- index of the slide loaded in the back item
+        overlay_item
+        front_photo
     """
+    global slide_items
+    global back_slide
+    global overlay_item
+    global front_photo
+
     # delete any existing images
     idlist = canv.find_all()
     for n, item in enumerate(idlist):
         canv.delete(item)
 
-    for n, item in enumerate(image_objects[startnum:]):#, startnum):
-        centered_x = viewport['w'] / 2
-        centered_y = viewport['h'] / 2
+    centered_x = viewport['w'] / 2
+    centered_y = viewport['h'] / 2
+    slide_items = [canv.create_image(centered_x, centered_y, tag='image', state=tk.HIDDEN)
+                   for n in range(2)]
+    overlay_item = canv.create_image(centered_x, centered_y, state=tk.HIDDEN)
+    back_slide = None
+    front_photo = None
 
-        imid = canv.create_image(centered_x, centered_y, image=item, tag='image', state=tk.HIDDEN)
-        fname = images_opened[n].split('/')[-1]
-        images_selected.append(fname)
 
+def decode_all(canv: object) -> None:
+    """Decode every slide not decoded yet, on the Tk thread.
 
-def display_slides(canv: object,
-                   pathlist: list,
-                   startnum: int
-                   ) -> None:
-    """Display a list of images to a Canvas, one at a time.
+    Used when cfg.lazy_decode is off: before the show starts, and for files
+    added to it.
+    """
+    for n, item in enumerate(slideshow.paths):
+        if n in slideshow.slides or n in slideshow.bad:
+            continue
+        im = slides_loader.load_slide(item,
+                                      viewport,
+                                      slide_cache,
+                                      disk_cache,
+                                      cfg.resample_quality)
+        if im is None:
+            slideshow.bad.add(n)
+        else:
+            with trace.span('photoimage', slide=n, file=slideshow.name(n)):
+                slideshow.slides[n] = ImageTk.PhotoImage(im)
+            slideshow.sources[n] = im
+
+
+def fill_window(canv: object, current: int) -> None:
+    """Queue the slides around current for decoding, and drop the others.
+
+    The current slide gets priority 0, the slides ahead of it come next
+    and the ones behind it last. A slide dropped while it is on screen
+    stays up: front_photo holds its PhotoImage until show_slide replaces it.
+
+    Uses these module variables:
+        slideshow
+        window_limit -- how many slides fit in the memory ceiling
+    """
+    if not cfg.lazy_decode:
+        return
+
+    slides = slideshow.slides
+    window = slides_loader.window_range(current,
+                                        len(slideshow),
+                                        cfg.window_ahead,
+                                        cfg.window_behind,
+                                        wrap=cfg.repeat == 'all')
+    if window_limit is not None:
+        window = window[:window_limit]
+    slideshow.window = window
+    prefetch.retain(window)
+
+    for n in [k for k in slides if k not in window]:
+        del slides[n]
+    for n in [k for k in slideshow.sources if k not in window]:
+        del slideshow.sources[n]
+
+    for priority, n in enumerate(window):
+        if n not in slides and n not in slideshow.bad:
+            prefetch.submit(n, slideshow.paths[n], viewport, priority)
+
+
+def poll_prefetch(canv: object) -> None:
+    """Collect decoded slides from the prefetch workers.
+
+    Runs on the Tk thread every cfg.prefetch_poll_ms; creating the
+    PhotoImage is the only part of decoding done here. The slide after the
+    one on screen goes straight into the back item, and after a resize the
+    slide on screen replaces its quick rescale in the front item.
+
+    Uses module variables:
+        front_stale -- the front item shows a quick rescale
+        front_photo
+    """
+    global front_stale
+    global front_photo
+
+    results = prefetch.results()
+    for n, im in results:
+        if im is None:
+            slideshow.bad.add(n)
+        elif n in slideshow.window:
+            with trace.span('photoimage', slide=n, file=slideshow.name(n)):
+                slideshow.slides[n] = ImageTk.PhotoImage(im)
+            slideshow.sources[n] = im
+            if slideshow.index is not None and n == slideshow.following(slideshow.index):
+                load_back(canv, n)
+            if front_stale and n == slideshow.index and zoom is None:
+                front_photo = slideshow.slides[n]
+                canv.itemconfigure(slide_items[0], image=front_photo)
+                front_stale = False
+    if results:
+        enforce_budget()
+
+    canv.after(cfg.prefetch_poll_ms, poll_prefetch, canv)
+
+
+def held_photos() -> list:
+    """Return the PhotoImages held: the slides' and the extra views'."""
+    photos = [p for p in (front_photo, quick_photo, overlay_photo, zoom_photo, animation_photo)
+              if p is not None]
+    if slideshow is not None:
+        photos += slideshow.slides.values()
+    return photos
+
+
+def enforce_budget() -> None:
+    """Bring the image data held back under cfg.memory_mb.
+
+    The slide cache gives way first. Then decoded slides are dropped from
+    the end of the window, which is the least useful end (see
+    window_range), and the window is kept that short until there is room
+    for another slide again. The slide on screen and the next one are
+    always kept.
+
+    Uses module variables:
+        budget -- a slides_memory.MemoryBudget, or None
+        window_limit
+    """
+    global window_limit
+
+    if budget is None or slideshow is None or not cfg.lazy_decode:
+        return
+
+    usage = budget.usage()
+    over = budget.over(usage)
+    if over > 0 and slide_cache.nbytes:
+        slide_cache.set_max_bytes(max(0, slide_cache.nbytes - over))
+        usage = budget.usage()
+        over = budget.over(usage)
+
+    window = list(slideshow.window)
+    sizes = {n: slides_memory.photo_bytes(slideshow.slides[n]) + slides_cache.image_bytes(slideshow.sources[n])
+             for n in window if n in slideshow.slides and n in slideshow.sources}
+    if over > 0:
+        evictions = budget.evictions
+        for pos in range(len(window) - 1, 1, -1):
+            if over <= 0:
+                break
+            n = window[pos]
+            window_limit = pos
+            if n in sizes:
+                del slideshow.slides[n]
+                del slideshow.sources[n]
+                over -= sizes[n]
+                budget.evictions += 1
+        if budget.evictions > evictions:
+            print(slides_memory.format_usage(budget.usage(), budget.limit))
+    elif sizes:
+        room = -over
+        per_slide = sum(sizes.values()) / len(sizes)
+        if window_limit is not None and room > 2 * per_slide:
+            window_limit += 1
+            if window_limit >= cfg.window_ahead + cfg.window_behind + 1:
+                window_limit = None
+        elif window_limit is None and slide_cache.max_bytes < cfg.cache_mb * 2**20:
+            slide_cache.set_max_bytes(min(cfg.cache_mb * 2**20, slide_cache.max_bytes + int(room // 2)))
+
+
+def caption_text(n: int) -> str:
+    """Return the caption of slide n, with the memory figures if they are wanted."""
+    text = slideshow.caption(n)
+    if budget is not None and cfg.memory_in_caption:
+        text += '    ' + slides_memory.format_usage(budget.usage(), budget.limit)
+    return text
+
+
+def load_back(canv: object, n: int) -> None:
+    """Give the hidden slide item the image of slide n, if it is decoded."""
+    global back_slide
+
+    if n in slideshow.slides:
+        canv.itemconfigure(slide_items[1], image=slideshow.slides[n])
+        back_slide = n
+    else:
+        back_slide = None
+
+
+def show_slide(canv: object, n: int) -> bool:
+    """Make slide n visible and update the caption.
+
+    Returns False, without changing the display, if slide n is still being
+    decoded; the scheduler then tries again a few ms later. A file that
+    couldn't be read is left out of the show (slides_sched.SKIP). When the
+    neighbours have been prefetched, a seek costs one item swap.
 
     Uses these module variables:
-        image_objects
-        run_status
-        images_selected
+        slideshow
+        slide_items
+        back_slide
         textvar -- a string variable in the image caption
+        transition -- the Transition running, if any
+        zoom
+        front_photo -- the PhotoImage of the slide on screen
+        animation_photo
+    """
+    global front_stale
+    global front_photo
+    global animation_photo
+    global zoom
+
+    fill_window(canv, n)
+    if prefetch.pending(n):
+        return False
+    if n in slideshow.bad:
+        return slides_sched.SKIP
+
+    if transition is not None:
+        transition.stop()
+    stop_animation()
+    zoom = None
+    before = slideshow.sources.get(slideshow.index)
+    after = slideshow.sources.get(n)
+
+    slides = slideshow.slides
+    front, back = slide_items
+    with trace.span('show', slide=n, file=slideshow.name(n)):
+        if back_slide != n or n not in slides:
+            canv.itemconfigure(back, image=slides.get(n, ''))
+        canv.itemconfigure(back, state=tk.NORMAL)
+        canv.itemconfigure(front, state=tk.HIDDEN)
+        slide_items.reverse()
+        front_stale = False
+        front_photo = slides.get(n)
+        animation_photo = None
+
+        load_back(canv, slideshow.following(n))
+        textvar.set(caption_text(n))
+
+    if cfg.transition != 'none' and before is not None and after is not None and before is not after:
+        start_transition(canv, before, after)
+    if cfg.animate and after is not None and slides_anim.may_be_animated(slideshow.paths[n]):
+        start_animation(canv, slideshow.paths[n], after.size)
+
+    if trace.enabled:
+        # Tk would redraw when idle; do it now so that it is timed
+        with trace.span('update', slide=n):
+            canv.update_idletasks()
+
+    return True
+
+
+def on_resize(ev) -> None:
+    """Follow a resize of the canvas; runs after cnv_ui.resize_viewport.
+
+    Configure events come in bursts while the window edge is dragged. Each
+    burst gets one quick rescale of the slide on screen when Tk is idle,
+    and resize_done runs once they have stopped for cfg.resize_debounce_ms.
+
+    Uses module variables:
+        resize_timer
+        quick_pending
+        zoom
+    """
+    global resize_timer
+    global quick_pending
+    global zoom
+
+    if slideshow is None or slideshow.index is None:
+        return
+
+    # the frames, or the zoomed view, would be the old size
+    stop_animation()
+    zoom = None
+
+    canv = ev.widget
+    for item in slide_items + [overlay_item]:
+        canv.coords(item, ev.width / 2, ev.height / 2)
+
+    if not quick_pending:
+        quick_pending = True
+        canv.after_idle(quick_rescale, canv, Image.Resampling.NEAREST)
+
+    if resize_timer is not None:
+        canv.after_cancel(resize_timer)
+    resize_timer = canv.after(cfg.resize_debounce_ms, resize_done, canv)
+
+
+def quick_rescale(canv: object, resample: int) -> None:
+    """Show the slide on screen rescaled to the viewport from its source image.
+
+    Uses module variables:
+        quick_photo -- the PhotoImage of the rescaled slide
+        front_stale
+    """
+    global quick_pending
+    global quick_photo
+    global front_stale
+
+    quick_pending = False
+    im = slideshow.sources.get(slideshow.index)
+    if im is None:
+        return
+
+    size = cnv_ui.init_image_size(im, viewport)
+    with trace.span('rescale', slide=slideshow.index):
+        quick_photo = ImageTk.PhotoImage(im.resize((size['w'], size['h']), resample))
+    canv.itemconfigure(slide_items[0], image=quick_photo)
+    front_stale = True
+
+
+def resize_done(canv: object) -> None:
+    """Decode the window again at the new viewport size.
+
+    The slide on screen is rescaled once more, with bilinear filtering,
+    and replaced by poll_prefetch when its new decode is ready; the slides
+    around it are decoded after it, nearest first.
+    """
+    global resize_timer
+    global back_slide
+    global front_photo
+
+    resize_timer = None
+    if slideshow is None or slideshow.index is None:
+        return
+
+    quick_rescale(canv, Image.Resampling.BILINEAR)
+
+    prefetch.cancel()
+    slideshow.slides = {}
+    back_slide = None
+    if cfg.lazy_decode:
+        fill_window(canv, slideshow.index)
+    else:
+        slideshow.sources = {}
+        decode_all(canv)
+        front_photo = slideshow.slides.get(slideshow.index)
+        canv.itemconfigure(slide_items[0], image=front_photo or '')
+        load_back(canv, slideshow.following(slideshow.index))
+
+
+def zoom_slide(ev, factor: float) -> None:
+    """Zoom the slide on screen in or out by factor, keeping the point under the mouse.
+
+    The first zoom in pauses the show. Zooming back out to the whole slide
+    shows the slide again.
+
+    Uses module variables:
+        zoom -- None, or the zoomed slide, its full size, the zoom
+                (1 is the whole slide) and the centre of the view in
+                pixels of the full image
+    """
+    global zoom
+
+    if slideshow is None or slideshow.index not in slideshow.sources:
+        return
+
+    canv = ev.widget
+    n = slideshow.index
+    if zoom is None or zoom['slide'] != n:
+        if factor <= 1:
+            return
+        try:
+            with slides_large.open_image(slideshow.paths[n]) as im:
+                full = im.size
+        except Exception as e:
+            print(f'error opening image: {str(e)}')
+            return
+        stop_animation()
+        if slideshow.sched is not None:
+            slideshow.sched.pause()
+        zoom = {'slide': n,
+                'full': full,
+                'scale': 1.0,
+                'center': (full[0] / 2, full[1] / 2),
+                'drag': None}
+
+    fit = slideshow.sources[n].width / zoom['full'][0]
+    scale = min(zoom['scale'] * factor, cfg.zoom_max / fit)
+    if scale <= 1:
+        end_zoom()
+        return
+
+    # the image point under the mouse stays there
+    dx = ev.x - canv.winfo_width() / 2
+    dy = ev.y - canv.winfo_height() / 2
+    x = zoom['center'][0] + dx / (fit * zoom['scale'])
+    y = zoom['center'][1] + dy / (fit * zoom['scale'])
+    zoom['scale'] = scale
+    zoom['center'] = (x - dx / (fit * scale), y - dy / (fit * scale))
+    show_zoom(canv)
+
+
+def start_pan(ev) -> None:
+    if zoom is not None:
+        zoom['drag'] = (ev.x, ev.y)
+
+
+def pan_slide(ev) -> None:
+    """Move the zoomed view with the mouse."""
+    if zoom is None or zoom['drag'] is None:
+        return
+
+    fit = slideshow.sources[zoom['slide']].width / zoom['full'][0]
+    x, y = zoom['drag']
+    zoom['drag'] = (ev.x, ev.y)
+    zoom['center'] = (zoom['center'][0] - (ev.x - x) / (fit * zoom['scale']),
+                      zoom['center'][1] - (ev.y - y) / (fit * zoom['scale']))
+    show_zoom(ev.widget)
+
+
+def zoom_box(canv: object) -> tuple:
+    """Return the part of the full image in view, and its size on screen.
+
+    The centre is moved, if need be, so that the view stays on the image.
+    """
+    width, height = zoom['full']
+    fit = slideshow.sources[zoom['slide']].width / width
+    shown = fit * zoom['scale']
+    half_w = min(canv.winfo_width() / 2 / shown, width / 2)
+    half_h = min(canv.winfo_height() / 2 / shown, height / 2)
+    x = min(max(zoom['center'][0], half_w), width - half_w)
+    y = min(max(zoom['center'][1], half_h), height - half_h)
+    zoom['center'] = (x, y)
+
+    box = (round(x - half_w), round(y - half_h), round(x + half_w), round(y + half_h))
+    size = (max(1, round((box[2] - box[0]) * shown)), max(1, round((box[3] - box[1]) * shown)))
+    return box, size
+
+
+def show_zoom(canv: object) -> None:
+    """Show the zoomed view, blown up from the slide at once, then decoded from the file.
+
+    The decode starts once the view has stopped changing for
+    cfg.resize_debounce_ms.
+
+    Uses module variables:
+        zoom_photo -- the PhotoImage of the zoomed view
+        zoom_timer
+    """
+    global zoom_photo
+    global zoom_timer
+
+    box, size = zoom_box(canv)
+    im = slideshow.sources[zoom['slide']]
+    fit = im.width / zoom['full'][0]
+    with trace.span('zoom_rescale', slide=zoom['slide']):
+        part = im.crop(tuple(v * fit for v in box)).resize(size, Image.Resampling.NEAREST)
+        zoom_photo = ImageTk.PhotoImage(part)
+    canv.itemconfigure(slide_items[0], image=zoom_photo)
+
+    if zoom_timer is not None:
+        canv.after_cancel(zoom_timer)
+    zoom_timer = canv.after(cfg.resize_debounce_ms, decode_zoom, canv)
+
+
+def decode_zoom(canv: object) -> None:
+    """Decode the zoomed view from the file on a thread; poll_zoom shows it.
+
+    Uses module variables:
+        zoom_timer
+        zoom_results -- (zoom, box, image) from the threads
+    """
+    global zoom_timer
+
+    zoom_timer = None
+    if zoom is None:
+        return
+
+    box, size = zoom_box(canv)
+    path = slideshow.paths[zoom['slide']]
+    resample, gap = slides_loader.RESAMPLE[cfg.resample_quality]
+
+    def decode(view):
+        try:
+            with trace.span('zoom_decode', slide=view['slide']):
+                im = slides_large.decode_region(path, box, size, resample, gap)
+        except Exception as e:
+            print(f'error opening image: {str(e)}')
+            im = None
+        zoom_results.put((view, box, im))
+
+    threading.Thread(target=decode, args=(zoom,), name='zoom', daemon=True).start()
+    canv.after(cfg.prefetch_poll_ms, poll_zoom, canv)
+
+
+def poll_zoom(canv: object) -> None:
+    """Show a decoded zoomed view, if it is still the one in view."""
+    global zoom_photo
+
+    try:
+        view, box, im = zoom_results.get_nowait()
+    except queue.Empty:
+        canv.after(cfg.prefetch_poll_ms, poll_zoom, canv)
+        return
+
+    if im is not None and view is zoom and zoom_timer is None and box == zoom_box(canv)[0]:
+        zoom_photo = ImageTk.PhotoImage(im)
+        canv.itemconfigure(slide_items[0], image=zoom_photo)
+
+
+def end_zoom(ev=None) -> None:
+    """Go back from the zoomed view to the whole slide; the show stays paused."""
+    global zoom
+
+    if zoom is None:
+        return
+
+    zoom = None
+    if slideshow is not None and slideshow.index is not None:
+        canv_1.itemconfigure(slide_items[0], image=front_photo or '')
+
+
+def start_transition(canv: object, before: object, after: object) -> None:
+    """Cover the change from image before to after with a transition.
+
+    The slide items have already been swapped; the overlay item shows the
+    old slide, then the transition frames, and is hidden at the end.
+
+    Uses module variables:
+        transition -- the Transition running, if any
+        overlay_photo -- the PhotoImage the frames are pasted into
+        transition_totals
+    """
+    global transition
+    global overlay_photo
+
+    size = (canv.winfo_width(), canv.winfo_height())
+    background = tuple(c >> 8 for c in canv.winfo_rgb(canv.cget('background')))
+    overlay_photo = ImageTk.PhotoImage('RGB', size)
+    overlay_photo.paste(slides_transition.compose(before, size, background))
+    canv.itemconfigure(overlay_item, image=overlay_photo, state=tk.NORMAL)
+    canv.tag_raise(overlay_item)
+
+    def done():
+        global transition
+
+        canv.itemconfigure(overlay_item, state=tk.HIDDEN)
+        slides_transition.add_stats(transition_totals, transition.stats())
+        transition = None
+
+    with trace.span('transition', kind=cfg.transition):
+        transition = slides_transition.Transition(canv,
+                                                  cfg.transition,
+                                                  before,
+                                                  after,
+                                                  size,
+                                                  cfg.transition_ms / 1000,
+                                                  cfg.transition_fps,
+                                                  overlay_photo.paste,
+                                                  done,
+                                                  background)
+
+
+def start_animation(canv: object, path: str, size: tuple) -> None:
+    """Play the frames of the slide on screen, if its file is animated.
+
+    The frames are pasted into their own PhotoImage, which replaces the
+    slide's in the front item when the first one comes; the slide's own
+    PhotoImage is left as it is, for the next time it is shown.
+
+    Uses module variables:
+        animation -- the Animation playing, if any
+        animation_photo -- the PhotoImage of the frames, counted in the
+                           memory budget; kept after the animation stops,
+                           while it may still be on screen
+    """
+    global animation
+    global animation_photo
+
+    front = slide_items[0]
+    photo = ImageTk.PhotoImage('RGBA', size)
+    animation_photo = photo
+
+    def show_frame(frame):
+        if canv.itemcget(front, 'image') != str(photo):
+            canv.itemconfigure(front, image=photo)
+        photo.paste(frame)
+
+    animation = slides_anim.Animation(canv,
+                                      path,
+                                      size,
+                                      show_frame,
+                                      cfg.resample_quality,
+                                      cfg.animation_ahead)
+
+
+def stop_animation() -> None:
+    """Stop the animation playing, if any, and add up its stats."""
+    global animation
+
+    if animation is not None:
+        animation.stop()
+        if animation.frames:
+            slides_anim.add_stats(animation_totals, animation.stats())
+        animation = None
+
+
+def display_slides(canv: object, startnum: int, more_coming: bool=False) -> None:
+    """Display the slideshow to a Canvas, one image at a time.
+
+    Hands the show to a SlideScheduler, which calls show_slide from Tk
+    timers and returns right away.
+
+    Uses these module variables:
+        slideshow
         delay_time
     """
-    # display first image
     print('in display_slides...')
 
-    idlist = canv.find_all()
-    for n, item in enumerate(idlist):
+    if slideshow.sched is not None:
+        slideshow.sched.stop()
+
+    for item in slide_items:
         canv.itemconfigure(item, state=tk.HIDDEN)
+    load_back(canv, startnum)
+
+    slideshow.sched = slides_sched.SlideScheduler(canv,
+                                                  lambda n, c=canv: show_slide(c, n),
+                                                  len(slideshow),
+                                                  delay_time,
+                                                  skip_late=cfg.skip_late_slides,
+                                                  on_done=report_timing,
+                                                  repeat=cfg.repeat)
+    slideshow.sched.set_count(len(slideshow), more_coming)
+    slideshow.sched.play(startnum)
+
+
+def report_timing(sched: object) -> None:
+    """Print the timing and cache stats of a show that has finished."""
+    print('show timing: ' + slides_sched.format_stats(sched.stats()))
+    print('slide cache: ' + slides_cache.format_stats(slide_cache.stats()))
+    if disk_cache is not None:
+        print('disk cache: ' + slides_cache.format_disk_stats(disk_cache.stats()))
+    if transition_totals:
+        print('transitions: ' + slides_transition.format_stats(transition_totals))
+    if animation_totals:
+        print('animations: ' + slides_anim.format_stats(animation_totals))
+    if budget is not None:
+        print(slides_memory.format_usage(budget.usage(), budget.limit, budget.peak)
+              + f', {budget.evictions} slides evicted')
+
+
+def add_image(canv: object, fpath: tuple | str, at: int | None=None) -> None:
+    """Add files to the running show, before slide at or at the end.
+
+    Only the new files are processed; the show keeps its place and its
+    decoded slides. If no show is running, this starts one.
+    """
+    if isinstance(fpath, str):
+        fpath = (fpath, )
+    if slideshow is None or slideshow.status in ('idle', 'done', 'stopped'):
+        use_canvas(canv, fpath)
+        return
 
-    canv.itemconfigure(idlist[startnum], state=tk.NORMAL)
-    fname = images_selected[startnum]
-    lab = str(startnum + 1) + ' of ' + str(len(pathlist)) + ': ' + fname
-    textvar.set(lab)
-    canv.update()
-
-    time.sleep(delay_time)
-
-    # display any remaining images
-    if len(idlist) > 1:
-        for n, item in enumerate(image_objects[startnum + 1:], startnum + 1):
-            if run_status is True:
-                # idlist = canv.find_all()
-                canv.itemconfigure(idlist[n], state=tk.NORMAL)
-                canv.itemconfigure(idlist[n-1], state=tk.HIDDEN)
-
-                fname = images_selected[n]
-                lab = str(n + 1) + ' of ' + str(len(pathlist)) + ': ' + fname
-                textvar.set(lab)
-                canv.update()
-
-                time.sleep(delay_time)
-            else:
-                break
+    if at is None:
+        at = len(slideshow)
+    show_changed(canv, slideshow.insert(at, fpath))
+
+
+def insert_images(ev=None) -> None:
+    """Ask for files to put after the slide on screen."""
+    if slideshow is None or slideshow.index is None:
+        return
+
+    file_path = filedialog.askopenfilenames(title="Select Images to Insert",
+                                            initialdir="images",
+                                            filetypes=[("Png files", "*.png"),
+                                                       ("Jpeg files", "jpg"),
+                                                       ("All files", "*.*")]
+                                            )
+    if file_path:
+        add_image(canv_1, file_path, slideshow.index + 1)
+
+
+def remove_current(ev=None) -> None:
+    """Take the slide on screen out of the show; it stays up until the next one."""
+    if slideshow is None or slideshow.index is None:
+        return
+
+    show_changed(canv_1, slideshow.remove([slideshow.index]))
 
 
-def add_image(canv: object, fpath: tuple | str) -> None:
-    use_canvas(canv, fpath)
+def show_changed(canv: object, moved) -> None:
+    """Catch up with slides added to or removed from the running show.
+
+    moved maps old slide indexes to new ones (see Slideshow.insert). Jobs
+    queued for the old indexes are dropped and the window is queued again;
+    slides already decoded are in the cache, so that is cheap.
+
+    Uses module variables:
+        slideshow
+        back_slide
+    """
+    global back_slide
+
+    prefetch.cancel()
+    if not cfg.lazy_decode:
+        decode_all(canv)
+    if back_slide is not None:
+        back_slide = moved(back_slide)
+
+    n = slideshow.index
+    if n is None:
+        n = slideshow.sched.upcoming
+    else:
+        textvar.set(caption_text(n))
+    fill_window(canv, min(n, max(0, len(slideshow) - 1)))
+    if slideshow.index is not None and back_slide != slideshow.following(slideshow.index):
+        load_back(canv, slideshow.following(slideshow.index))
 
 
 def set_delay(var: tk.StringVar) -> None:
     global delay_time
 
     delay_time = int(var.get())
+    if slideshow is not None and slideshow.sched is not None:
+        slideshow.sched.set_delay(delay_time)
 
 
 def pause_show(ev):
     """Temporarily halt the sequential display of images.
 
     uses module level objects:
-    images_opened, image_objects
+    slideshow
     """
-    global run_status
-
-    # print(f'in pause_show')
-
-    if len(images_opened) > 0:
-        run_status = False
-
-    # print(f'    images shown: {len(images_selected)}, last: {images_selected[-1]}')
-    # files = [i.split('/')[-1] for i in images_opened]
-    # print(f'    {files=}')
-    # print(f'    {len(image_objects)=}')
+    if slideshow is not None and slideshow.sched is not None:
+        slideshow.sched.pause()
 
 
 def resume_show(ev, canv: object) -> None:
-    global images_opened
-    global run_status
-
-    run_status = True
+    """Continue a paused show with the slide after the one displayed."""
     print(f'in resume_show')
-    # print(f'    next: {image_objects[num]} ({images_opened[num]})')
 
-    thisnum = 0
-    # which image is displayed?
-    for n, item in enumerate(canv.find_all()):
-        if canv.itemcget(item, "state") == "normal":
-            thisnum = n + 1
-            # print(f'    {thisnum=}, {len(images_opened)}')
-            break    # only one is normal
-
-    if thisnum < len(images_opened):
-        display_slides(canv, tuple(images_opened), thisnum)
+    if slideshow is not None and slideshow.sched is not None:
+        slideshow.sched.resume()
 
 
 # def restart_slides(ev, canv: object) -> None:
 def restart_slides(canv: object) -> None:
-    global images_opened
-    global images_selected
-    global run_status
-
-    run_status = True
-    thisnum = 0
-    display_slides(canv, tuple(images_opened), thisnum)
+    if slideshow is not None and slideshow.sched is not None:
+        prefetch.cancel()
+        slideshow.sched.restart()
 
 
-def step_forward():
+def step_forward(ev=None):
     """Display the next image in the current show list"""
-    # if run_status:
-    if run_status == False:
-        pass
+    if slideshow is not None:
+        slideshow.next()
 
 
-def step_back():
+def step_back(ev=None):
     """Display the previous image in current show list."""
-    # if run_status:
-    if run_status == False:
-        pass
+    if slideshow is not None:
+        slideshow.prev()
+
+
+def step_first(ev=None):
+    if slideshow is not None:
+        slideshow.first()
+
+
+def step_last(ev=None):
+    if slideshow is not None:
+        slideshow.last()
+
+
+def jump_to_slide(ev=None):
+    """Ask for a slide number and display that slide."""
+    if slideshow is None:
+        return
+
+    number = simpledialog.askinteger('Go to slide',
+                                     f'Slide number (1 - {len(slideshow)}):',
+                                     parent=root,
+                                     minvalue=1,
+                                     maxvalue=len(slideshow))
+    if number is not None:
+        slideshow.jump(number)
 
 
 # not needed?
@@ -280,11 +1134,48 @@ style2 = sttk.create_styles()
 
 viewport = {'w': 400, 'h': 300, 'gutter': 10}
 my_pady = 10
-run_status=True
-images_selected = []
-images_opened = []
-image_objects = []
-lens_image_objects = []
+slideshow = None
+folder_scan = None
+resize_timer = None
+quick_pending = False
+quick_photo = None
+front_stale = False
+# the PhotoImage in the front item; Tk deletes an image when its last
+# Python reference goes, so this keeps the slide on screen up after it
+# has left slideshow.slides
+front_photo = None
+overlay_item = None
+overlay_photo = None
+transition = None
+transition_totals = {}
+animation = None
+animation_photo = None
+animation_totals = {}
+zoom = None
+zoom_photo = None
+zoom_timer = None
+zoom_results = queue.SimpleQueue()
+catalog = None
+slide_items = []
+back_slide = None
+
+slide_cache = slides_cache.SlideCache(cfg.cache_mb * 2**20)
+disk_cache = None
+if cfg.disk_cache_dir is not None:
+    disk_cache = slides_cache.DiskCache(cfg.disk_cache_dir, cfg.disk_cache_mb * 2**20)
+prefetch = slides_loader.Prefetcher(cfg.prefetch_workers,
+                                    cfg.prefetch_queue,
+                                    slide_cache,
+                                    disk_cache,
+                                    cfg.resample_quality)
+budget = None
+window_limit = None
+if cfg.memory_mb is not None:
+    budget = slides_memory.MemoryBudget(cfg.memory_mb * 2**20)
+    budget.track('decoded', lambda: list(slideshow.sources.values()) if slideshow is not None else [])
+    budget.track('tk', held_photos, slides_memory.photo_bytes)
+    budget.track('animation', lambda: animation.images() if animation is not None else [])
+    budget.track('cache', slide_cache.images)
 
 canv_1 = tk.Canvas(root,
                    width=viewport['w'],
@@ -294,11 +1185,19 @@ canv_1 = tk.Canvas(root,
                    )
 canv_1.pack(fill='both', expand=True)
 canv_1.configure(width=viewport['w'], height=viewport['h'])
+canv_1.after(cfg.prefetch_poll_ms, poll_prefetch, canv_1)
 canv_1.bind('<Configure>', lambda ev,
                                   vp=viewport,
                                   f=canv_config_flag: cnv_ui.resize_viewport(ev, vp, f))
+canv_1.bind('<Configure>', on_resize, add='+')
 
 # canv_1.bind('<Button-1>', lambda ev, vp=viewport: read_but1(ev, vp))
+canv_1.bind('<MouseWheel>', lambda ev: zoom_slide(ev, cfg.zoom_step if ev.delta > 0 else 1 / cfg.zoom_step))
+canv_1.bind('<Button-4>', lambda ev: zoom_slide(ev, cfg.zoom_step))
+canv_1.bind('<Button-5>', lambda ev: zoom_slide(ev, 1 / cfg.zoom_step))
+canv_1.bind('<ButtonPress-1>', start_pan)
+canv_1.bind('<B1-Motion>', pan_slide)
+canv_1.master.bind('<Escape>', end_zoom)
 
 canv_1.master.bind('<Control-Down>',
                    lambda ev: pause_show(ev)
@@ -307,6 +1206,16 @@ canv_1.master.bind('<Control-Up>',
                    lambda ev,
                           canv=canv_1: resume_show(ev, canv)
                    )
+canv_1.master.bind('<Control-Right>', step_forward)
+canv_1.master.bind('<Control-Left>', step_back)
+canv_1.master.bind('<Control-Home>', step_first)
+canv_1.master.bind('<Control-End>', step_last)
+canv_1.master.bind('<Control-g>', jump_to_slide)
+canv_1.master.bind('<Control-s>', save_show)
+canv_1.master.bind('<Control-i>', index_folder)
+canv_1.master.bind('<Control-f>', find_slides)
+canv_1.master.bind('<Control-Insert>', insert_images)
+canv_1.master.bind('<Control-Delete>', remove_current)
 
 # report = ttk.Frame(root)
 # report.pack(fill='both', expand=True)
@@ -319,6 +1228,9 @@ caption.update()
 open_button = ttk.Button(root, text="Open Files", command=lambda c=canv_1: select_image_file(c))
 open_button.pack(pady=my_pady)
 
+folder_button = ttk.Button(root, text="Open Folder", command=lambda c=canv_1: select_folder(c))
+folder_button.pack(pady=my_pady)
+
 ui_fr = ttk.Frame(root, style='basic.TFrame')
 
 delay = tk.StringVar(value='3')
@@ -359,7 +1271,7 @@ btnq.update()
 # total_ht = (canv_1.winfo_height() + caption.winfo_height() + open_button.winfo_height() +
 #             ui_fr.winfo_height() + btnq.winfo_height()
 #             )
-widgets = [canv_1, caption, open_button, ui_fr, btnq]
+widgets = [canv_1, caption, open_button, folder_button, ui_fr, btnq]
 total_ht = 0
 for wid in widgets:
     total_ht += (wid.winfo_height() + wid.pack_info()['pady'] * 2)
@@ -0,0 +1,111 @@
+"""
+program: slides_canvas_cfg.py
+
+purpose: For project slideshow.
+
+comments: Settings for slides_canvas. Change them here rather than in the
+          application code.
+
+history:
+-------
+10-18-2026  Add settings for lazy, windowed decoding.
+10-18-2026  Add settings for the prefetch workers.
+10-18-2026  Add skip_late_slides.
+10-18-2026  Add cache_mb.
+10-18-2026  Add disk_cache_dir and disk_cache_mb.
+10-18-2026  Add resample_quality.
+10-18-2026  Add folder_patterns and scan_poll_ms.
+10-18-2026  Add shuffle and repeat.
+10-18-2026  Add catalog_file.
+10-18-2026  Add resize_debounce_ms.
+10-18-2026  Add transition, transition_ms and transition_fps.
+10-18-2026  Add animate and animation_ahead.
+10-18-2026  Add zoom_step and zoom_max.
+10-18-2026  Add memory_mb and memory_in_caption.
+"""
+import os
+
+import slides_source
+
+# Lazy decoding: only the current slide and a few on either side of it are
+# decoded and held in memory. Set lazy_decode to False to decode the whole
+# playlist before the show starts (the old behavior).
+lazy_decode = True
+window_ahead = 2
+window_behind = 1
+
+# Prefetch: slides in the window are decoded and resized on worker threads.
+# prefetch_queue limits the number of slides waiting for a worker, and the
+# Tk thread collects finished slides every prefetch_poll_ms.
+prefetch_workers = 2
+prefetch_queue = 8
+prefetch_poll_ms = 20
+
+# Slides are shown on a fixed schedule: start + n * delay. With
+# skip_late_slides, a slide that isn't ready by the time the next one is due
+# is dropped, so a long show still ends on time.
+skip_late_slides = False
+
+# Size limit for the cache of resized slides, in MB. A show, or a loop of
+# it, that fits in the cache is only decoded once.
+cache_mb = 256
+
+# Resized slides are also saved in disk_cache_dir, so that the next run of
+# the same files starts without decoding them. Files are removed, least
+# recently used first, to keep the directory under disk_cache_mb. Set
+# disk_cache_dir to None to turn this off.
+disk_cache_dir = os.path.join(os.path.expanduser('~'), '.cache', 'slideshow')
+disk_cache_mb = 1024
+
+# Resampling used to size slides for the viewport: 'fast', 'balanced' or
+# 'best' (see slides_loader.RESAMPLE).
+resample_quality = 'balanced'
+
+# Open Folder plays the files in a folder (and, if asked, its subfolders)
+# whose names match one of folder_patterns. The show starts on the first
+# match; the files found since are added every scan_poll_ms.
+folder_patterns = slides_source.IMAGE_PATTERNS
+scan_poll_ms = 100
+
+# Play order: with shuffle, each show plays its files in a random order
+# (see slides_playlist.Shuffle). repeat is 'off', 'all' to loop the show,
+# or 'one' to keep showing the same slide.
+shuffle = False
+repeat = 'off'
+
+# The image catalog (see slides_catalog): Ctrl-i indexes a folder into it,
+# Ctrl-f finds images in it and plays them.
+catalog_file = os.path.join(os.path.expanduser('~'), '.cache', 'slideshow_catalog.sqlite')
+
+# While the window is being resized, the slide on screen is rescaled
+# quickly (nearest neighbour) from the image it was made from. Once no
+# resize has come for resize_debounce_ms, it is rescaled with bilinear
+# filtering, and then it and its neighbours are decoded again at the new
+# size, with resample_quality, by the prefetch workers.
+resize_debounce_ms = 150
+
+# Transition between slides: 'none', 'crossfade', 'slide' or 'wipe' (see
+# slides_transition), lasting transition_ms at up to transition_fps frames
+# a second. Frames that aren't ready in time are dropped.
+transition = 'none'
+transition_ms = 500
+transition_fps = 30
+
+# Play animated GIF, APNG and WebP files during their slide (see
+# slides_anim), holding at most animation_ahead decoded frames.
+animate = True
+animation_ahead = 4
+
+# Zooming into the slide on screen with the mouse wheel: each step is
+# zoom_step, up to zoom_max screen pixels per image pixel. The part in view
+# is decoded from the file (see slides_large.decode_region).
+zoom_step = 1.25
+zoom_max = 4
+
+# A ceiling, in MB, on the image data held: decoded slides, their Tk
+# PhotoImages and the slide cache (see slides_memory). None for no
+# ceiling. Over it, the slide cache shrinks first, then the window of
+# decoded slides, farthest ahead or behind first; needs lazy_decode. With
+# memory_in_caption, the figures are shown after the file name.
+memory_mb = None
+memory_in_caption = True
@@ -0,0 +1,297 @@
+"""
+program: slides_catalog.py
+
+purpose: For project slideshow.
+
+comments: A catalog of image files in an SQLite database: path, file size,
+          modification time, size in pixels, EXIF orientation, capture
+          date, format and a hash of the content. Indexer fills it from a
+          folder scan on a background thread; a rescan only reads files
+          that are new or whose size or modification time has changed.
+
+          find() answers questions like "landscape images taken in May,
+          oldest first" from the database alone, and returns a
+          slides_playlist.Playlist that already holds each image's
+          metadata, so a show can start without opening any file.
+
+history:
+-------
+10-18-2026  Catalog, Indexer, find and QueryDialog.
+10-18-2026  Gigapixel images are indexed too (slides_large.open_image).
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import tkinter as tk
+from tkinter import ttk, simpledialog
+
+import slides_large
+import slides_playlist
+import slides_source
+
+SCHEMA = """
+create table if not exists images (
+    path        text primary key,
+    folder      text not null,
+    size        integer not null,
+    mtime_ns    integer not null,
+    width       integer not null,
+    height      integer not null,
+    orientation integer not null,
+    taken       text,
+    format      text not null,
+    hash        text not null
+);
+create index if not exists images_folder on images (folder);
+create index if not exists images_taken on images (taken);
+"""
+
+# EXIF tags: orientation and date/time in the main IFD, date/time original
+# in the Exif IFD
+EXIF_IFD = 0x8769
+DATETIME = 0x0132
+DATETIME_ORIGINAL = 0x9003
+
+# find() sort orders
+ORDERS = {'taken': 'taken is null, taken, path',
+          'path': 'path',
+          'mtime': 'mtime_ns, path',
+          'size': 'width * height desc, path'}
+
+# orientations 5 to 8 are turned 90 degrees, so width and height swap
+_SHOWN_WIDTH = 'case when orientation between 5 and 8 then height else width end'
+_SHOWN_HEIGHT = 'case when orientation between 5 and 8 then width else height end'
+SHAPES = {'landscape': f'{_SHOWN_WIDTH} > {_SHOWN_HEIGHT}',
+          'portrait': f'{_SHOWN_WIDTH} < {_SHOWN_HEIGHT}',
+          'square': f'{_SHOWN_WIDTH} = {_SHOWN_HEIGHT}'}
+
+
+def connect(db_path: str) -> sqlite3.Connection:
+    """Open the catalog database, creating it if need be.
+
+    A connection belongs to the thread that opened it; the Indexer opens
+    its own. WAL mode lets find() read while an Indexer is writing.
+    """
+    folder = os.path.dirname(db_path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    db = sqlite3.connect(db_path)
+    db.execute('pragma journal_mode=wal')
+    db.executescript(SCHEMA)
+    return db
+
+
+def file_hash(path: str) -> str:
+    """Return a hash of the file's content."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        while chunk := f.read(2**20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_image_info(path: str, st: os.stat_result) -> tuple | None:
+    """Return a row for the images table, reading the file's header and content.
+
+    Returns None if the file isn't an image that can be read.
+    """
+    try:
+        with slides_large.open_image(path) as im:
+            exif = im.getexif()
+            taken = exif.get_ifd(EXIF_IFD).get(DATETIME_ORIGINAL) or exif.get(DATETIME)
+            row = (path, os.path.dirname(path), st.st_size, st.st_mtime_ns,
+                   im.width, im.height, exif.get(slides_playlist.ORIENTATION, 1),
+                   exif_date(taken), im.format or '')
+        return row + (file_hash(path),)
+    except Exception as e:
+        print(f'error opening image: {str(e)}')
+        return None
+
+
+def exif_date(value) -> str | None:
+    """Return an EXIF date 'YYYY:MM:DD HH:MM:SS' as 'YYYY-MM-DD HH:MM:SS'."""
+    if not isinstance(value, str) or len(value) < 10:
+        return None
+    value = value.strip('\0 ')
+    return value[:10].replace(':', '-') + value[10:]
+
+
+class Indexer:
+    """Add a folder's images to the catalog on a background thread.
+
+    Files already in the catalog with the same size and modification time
+    are not read again. Once the whole folder has been scanned, entries
+    for files under it that are gone are deleted (not after stop()).
+
+    scanned, added, updated, unchanged and removed count the files as the
+    indexer goes; done is True when it has finished.
+    """
+    def __init__(self,
+                 db_path: str,
+                 folder: str,
+                 recursive: bool=True,
+                 patterns=slides_source.IMAGE_PATTERNS,
+                 batch: int=200
+                 ):
+        self.db_path = db_path
+        self.folder = os.path.abspath(folder)
+        self.recursive = recursive
+        self.patterns = patterns
+        self.batch = batch
+        self.scanned = 0
+        self.added = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.removed = 0
+        self.done = False
+        self._stop = threading.Event()
+
+        threading.Thread(target=self._run, name='catalog-index', daemon=True).start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def summary(self) -> str:
+        return (f'{self.folder}: {self.scanned} files, {self.added} added, '
+                f'{self.updated} updated, {self.unchanged} unchanged, {self.removed} removed')
+
+    def _run(self) -> None:
+        db = connect(self.db_path)
+        known = {}
+        seen = set()
+        rows = []
+        for path in slides_source.scan_folder(self.folder, self.recursive, self.patterns, self._stop):
+            self.scanned += 1
+            seen.add(path)
+            folder = os.path.dirname(path)
+            if folder not in known:
+                known[folder] = {p: (size, mtime) for p, size, mtime in
+                                 db.execute('select path, size, mtime_ns from images where folder = ?',
+                                            (folder,))}
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+
+            old = known[folder].get(path)
+            if old == (st.st_size, st.st_mtime_ns):
+                self.unchanged += 1
+                continue
+
+            row = read_image_info(path, st)
+            if row is None:
+                continue
+            rows.append(row)
+            if old is None:
+                self.added += 1
+            else:
+                self.updated += 1
+            if len(rows) >= self.batch:
+                self._write(db, rows)
+                rows = []
+
+        self._write(db, rows)
+        if not self._stop.is_set():
+            self._remove_missing(db, seen)
+        db.close()
+        self.done = True
+
+    def _write(self, db: sqlite3.Connection, rows: list) -> None:
+        with db:
+            db.executemany('insert or replace into images values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+
+    def _remove_missing(self, db: sqlite3.Connection, seen: set) -> None:
+        prefix = os.path.join(self.folder, '')
+        if self.recursive:
+            cur = db.execute('select path from images where folder = ? or substr(folder, 1, ?) = ?',
+                             (self.folder, len(prefix), prefix))
+        else:
+            cur = db.execute('select path from images where folder = ?', (self.folder,))
+        gone = [(path,) for (path,) in cur if path not in seen]
+        with db:
+            db.executemany('delete from images where path = ?', gone)
+        self.removed = len(gone)
+
+
+def find(db: sqlite3.Connection,
+         shape: str | None=None,
+         taken_from: str | None=None,
+         taken_to: str | None=None,
+         folder: str | None=None,
+         name: str | None=None,
+         order: str='taken',
+         limit: int | None=None
+         ) -> slides_playlist.Playlist:
+    """Return a Playlist of the catalog's images that match, with their metadata.
+
+    shape is 'landscape', 'portrait' or 'square', as the image is shown
+    (after EXIF rotation). taken_from and taken_to are dates 'YYYY-MM-DD',
+    both included; images without a capture date don't match a date range.
+    folder includes its subfolders. name is a file name pattern, as in
+    SQL like ('%' for any characters). order is a key of ORDERS.
+    """
+    where = []
+    args = []
+    if shape is not None:
+        where.append(SHAPES[shape])
+    if taken_from:
+        where.append('taken >= ?')
+        args.append(taken_from)
+    if taken_to:
+        where.append('taken < ?')
+        args.append(taken_to + '~')
+    if folder:
+        folder = os.path.abspath(folder)
+        where.append('(folder = ? or substr(folder, 1, ?) = ?)')
+        args += [folder, len(folder) + 1, os.path.join(folder, '')]
+    if name:
+        where.append('path like ?')
+        args.append('%' + os.sep + name)
+
+    sql = 'select path, mtime_ns, width, height, orientation, format from images'
+    if where:
+        sql += ' where ' + ' and '.join(where)
+    sql += ' order by ' + ORDERS[order]
+    if limit:
+        sql += f' limit {int(limit)}'
+
+    playlist = slides_playlist.Playlist()
+    for path, *meta in db.execute(sql, args):
+        playlist.append(path, tuple(meta))
+
+    return playlist
+
+
+class QueryDialog(simpledialog.Dialog):
+    """Ask for the find() arguments; result is a dict of them, or None."""
+    def body(self, master):
+        self.shape = tk.StringVar(value='any')
+        self.taken_from = tk.StringVar()
+        self.taken_to = tk.StringVar()
+        self.folder = tk.StringVar()
+        self.name = tk.StringVar()
+        self.order = tk.StringVar(value='taken')
+
+        fields = [('Shape', ttk.Combobox(master, textvariable=self.shape, state='readonly',
+                                         values=['any'] + list(SHAPES))),
+                  ('Taken from (YYYY-MM-DD)', ttk.Entry(master, textvariable=self.taken_from)),
+                  ('Taken to (YYYY-MM-DD)', ttk.Entry(master, textvariable=self.taken_to)),
+                  ('In folder', ttk.Entry(master, textvariable=self.folder)),
+                  ('File name like', ttk.Entry(master, textvariable=self.name)),
+                  ('Sort by', ttk.Combobox(master, textvariable=self.order, state='readonly',
+                                           values=list(ORDERS)))]
+        for row, (text, widget) in enumerate(fields):
+            ttk.Label(master, text=text).grid(row=row, column=0, sticky='w', padx=5, pady=2)
+            widget.grid(row=row, column=1, sticky='ew', padx=5, pady=2)
+
+        return fields[0][1]
+
+    def apply(self):
+        shape = self.shape.get()
+        self.result = {'shape': None if shape == 'any' else shape,
+                       'taken_from': self.taken_from.get().strip() or None,
+                       'taken_to': self.taken_to.get().strip() or None,
+                       'folder': self.folder.get().strip() or None,
+                       'name': self.name.get().strip() or None,
+                       'order': self.order.get()}
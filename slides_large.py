@@ -0,0 +1,298 @@
+"""
+program: slides_large.py
+
+purpose: For project slideshow.
+
+comments: Decoding very large images (gigapixel scans) without holding the
+          whole image in memory. decode_region makes a slide, or a zoomed
+          view of part of an image, at the size it will be shown, taking
+          the cheapest route the file allows:
+
+          - JPEG: draft() decodes at 1/2, 1/4 or 1/8 scale.
+          - multi-page (pyramid) TIFF: the smallest page that still has
+            enough pixels is decoded instead of the full one.
+          - uncompressed layouts (TIFF, BMP, PPM): rows are read straight
+            from the file in bands, and each band is reduced before the
+            next is read; for a region, only its columns are read.
+          - anything else (PNG, compressed TIFF) has to be decoded whole,
+            which is refused over max_bytes.
+
+          Pillow's decompression bomb check would refuse these files
+          outright. open_image opens an image over its limit with
+          open_large, which turns the check off for that one open; such
+          images are always is_large, so that only decode_region, with
+          its own memory limits, decodes them. Every other Image.open in
+          the process keeps the check.
+
+history:
+-------
+10-18-2026  decode_region, is_large and fit.
+10-18-2026  reduce_image is public, for slides_loader.decode_to_size too; it
+            also converts 16-bit images.
+10-18-2026  The decompression bomb check is no longer turned off for the whole
+            process; add open_image and open_large. Bands are sized by
+            their decoded bytes too, which bilevel images need.
+10-18-2026  Palette bands are converted before they are pasted, so a region read
+            at full scale keeps its colours.
+"""
+import contextlib
+import math
+import threading
+
+from PIL import Image
+
+# images with more pixels than this go through decode_region
+LARGE_PIXELS = 50_000_000
+# memory for one band of rows, and the most a whole decode may use
+BAND_BYTES = 64 * 2**20
+MAX_BYTES = 1024 * 2**20
+
+# reduce() can't take these modes, or averages palette indexes; they are
+# converted first (a palette image without transparency goes to RGB)
+REDUCE_MODES = {'P': 'RGBA', 'PA': 'RGBA', '1': 'L', 'I;16': 'I', 'I;16L': 'I', 'I;16B': 'I'}
+
+# held while Image.MAX_IMAGE_PIXELS is changed
+_limit_lock = threading.Lock()
+
+
+def is_large(im: Image.Image, limit: int | None=None) -> bool:
+    """Return True if im has more than limit pixels.
+
+    The default is LARGE_PIXELS, or Pillow's decompression bomb limit if
+    that is lower, since open_image may have let such an image through.
+    """
+    if limit is None:
+        limit = LARGE_PIXELS
+        if Image.MAX_IMAGE_PIXELS is not None:
+            limit = min(limit, 2 * Image.MAX_IMAGE_PIXELS)
+    return im.width * im.height > limit
+
+
+def open_image(path: str) -> Image.Image:
+    """Image.open path, with open_large for an image over the decompression bomb limit.
+
+    Decode the result only if it isn't is_large; send it to decode_region
+    otherwise.
+    """
+    try:
+        return Image.open(path)
+    except Image.DecompressionBombError:
+        return open_large(path)
+
+
+def open_large(path: str) -> Image.Image:
+    """Image.open path without Pillow's decompression bomb check.
+
+    Only the header is read. The check is global, so it is off, for every
+    thread, while the header is read.
+    """
+    with _no_pixel_limit():
+        return Image.open(path)
+
+
+@contextlib.contextmanager
+def _no_pixel_limit():
+    with _limit_lock:
+        limit = Image.MAX_IMAGE_PIXELS
+        Image.MAX_IMAGE_PIXELS = None
+        try:
+            yield
+        finally:
+            Image.MAX_IMAGE_PIXELS = limit
+
+
+def fit(size: tuple, bound: tuple) -> tuple:
+    """Return size scaled down, keeping its shape, to fit within bound."""
+    scale = min(bound[0] / size[0], bound[1] / size[1], 1.0)
+    return (max(1, round(size[0] * scale)), max(1, round(size[1] * scale)))
+
+
+def decode_region(path: str,
+                  box: tuple | None,
+                  size: tuple,
+                  resample: int=Image.Resampling.BICUBIC,
+                  gap: int=2,
+                  band_bytes: int=BAND_BYTES,
+                  max_bytes: int=MAX_BYTES
+                  ) -> Image.Image:
+    """Return the part of the image at path inside box, resized to size.
+
+    box is (left, top, right, bottom) in pixels of the full image; None is
+    the whole image. resample and gap are as in slides_loader.RESAMPLE:
+    the image is reduced by whole factors while it stays gap times above
+    size, then resampled.
+
+    Raises ValueError if the image would have to be decoded whole and that
+    would take more than max_bytes, and OSError if the file can't be read.
+    """
+    with open_large(path) as im:
+        full_width = im.width
+        if box is None:
+            box = (0, 0, im.width, im.height)
+        # pixels of the full image per pixel of the result
+        scale = min((box[2] - box[0]) / size[0], (box[3] - box[1]) / size[1])
+
+        if im.format == 'JPEG':
+            im.draft(im.mode, (math.ceil(im.width / scale), math.ceil(im.height / scale)))
+        page = _pick_page(im, scale)
+
+        # the box in pixels of the page or draft
+        page_scale = im.width / full_width
+        box = (math.floor(box[0] * page_scale), math.floor(box[1] * page_scale),
+               math.ceil(box[2] * page_scale), math.ceil(box[3] * page_scale))
+        factor = max(1, math.floor(scale * page_scale / gap))
+
+        layout = _raw_layout(im)
+        if layout is not None:
+            region = _read_bands(path, page, im, layout, box, factor, band_bytes)
+        else:
+            nbytes = im.width * im.height * len(im.getbands())
+            if nbytes > max_bytes:
+                raise ValueError(f'{im.width}x{im.height} {im.format} image is too large to decode '
+                                 f'({nbytes // 2**20} MB)')
+            im.load()
+            with _no_pixel_limit():
+                region = im.crop(box)
+            region = reduce_image(region, factor)
+
+    return region.resize(size, resample)
+
+
+def reduce_image(im: Image.Image, factor: int) -> Image.Image:
+    """reduce() im by factor, converting it first if its mode needs it (REDUCE_MODES)."""
+    if factor < 2:
+        return im
+    if im.mode == 'P' and 'transparency' not in im.info:
+        im = im.convert('RGB')
+    elif im.mode in REDUCE_MODES:
+        im = im.convert(REDUCE_MODES[im.mode])
+    return im.reduce(factor)
+
+
+def _pick_page(im: Image.Image, scale: float) -> int:
+    """Seek to the smallest page of a pyramid TIFF that has enough pixels.
+
+    The pages have to be the same shape as the first to count as levels.
+    Returns the page number, with im on it.
+    """
+    if im.format != 'TIFF' or getattr(im, 'n_frames', 1) < 2:
+        return 0
+
+    width, height = im.size
+    best = 0
+    best_width = width
+    for page in range(1, im.n_frames):
+        im.seek(page)
+        if abs(im.width / width - im.height / height) > 0.01:
+            continue
+        # enough pixels: the page has at least one per pixel of the result
+        if width / scale <= im.width < best_width:
+            best = page
+            best_width = im.width
+
+    im.seek(best)
+    return best
+
+
+def _raw_layout(im: Image.Image) -> list | None:
+    """Return [(tile, rawmode, stride, orientation, bits)] if every tile is uncompressed.
+
+    bits is the number of bits per pixel in the file, and stride is filled
+    in where the file leaves it as 0. Returns None for
+    compressed data, or raw modes whose row size can't be worked out.
+    """
+    layout = []
+    for tile in im.tile:
+        if tile[0] != 'raw':
+            return None
+        args = tile[3]
+        if isinstance(args, str):
+            args = (args, 0, 1)
+        rawmode, stride, orientation = (tuple(args) + (0, 1))[:3]
+        try:
+            bits = len(Image.new(im.mode, (8, 1)).tobytes('raw', rawmode))
+        except Exception:
+            return None
+        if not stride:
+            x0, y0, x1, y1 = tile[1]
+            stride = ((x1 - x0) * bits + 7) // 8
+        layout.append((tile, rawmode, stride, orientation, bits))
+    return layout
+
+
+def _read_bands(path: str,
+                page: int,
+                im: Image.Image,
+                layout: list,
+                box: tuple,
+                factor: int,
+                band_bytes: int
+                ) -> Image.Image:
+    """Read the rows of box from an uncompressed image, a band at a time.
+
+    Each band is reduced by factor before the next one is read, so memory
+    use is one band plus the result.
+    """
+    left, top, right, bottom = box
+    # columns that don't start on a byte can't be read on their own
+    whole_rows = any(bits % 8 for tile, rawmode, stride, orientation, bits in layout)
+    read_left, read_right = (0, im.width) if whole_rows else (left, right)
+    # the bytes of a row in the file, or decoded (a bilevel pixel takes a
+    # byte), whichever is more
+    row_bytes = max(max(stride for tile, rawmode, stride, orientation, bits in layout),
+                    (read_right - read_left) * len(Image.new(im.mode, (1, 1)).tobytes()))
+    rows = max(factor, band_bytes // row_bytes // factor * factor)
+
+    region = None
+    for y0 in range(top, bottom, rows):
+        y1 = min(y0 + rows, bottom)
+        with _read_rows(path, page, layout, read_left, y0, read_right, y1) as band:
+            if whole_rows:
+                # the band is already in memory, so its size is no risk
+                with _no_pixel_limit():
+                    band = band.crop((left, 0, right, y1 - y0))
+            if im.mode == 'P':
+                band.putpalette(im.getpalette())
+            # reduced (or copied) before the file is closed
+            band = reduce_image(band, factor) if factor >= 2 else band.copy()
+        if band.mode == 'P':
+            # region is a new image, with the default palette
+            band = band.convert('RGBA' if 'transparency' in band.info else 'RGB')
+        if region is None:
+            region = Image.new(band.mode, (math.ceil((right - left) / factor),
+                                           math.ceil((bottom - top) / factor)))
+        region.paste(band, (0, (y0 - top) // factor))
+    return region
+
+
+def _read_rows(path: str, page: int, layout: list, left: int, top: int, right: int, bottom: int) -> Image.Image:
+    """Decode the pixels of box (left, top, right, bottom) of an uncompressed image.
+
+    The file is opened again with a tile list that covers only the box, so
+    Pillow reads and decodes nothing else. left must fall on a byte. The
+    image may be mapped from the file: use it before closing it.
+    """
+    tiles = []
+    for (name, (x0, y0, x1, y1), offset, args), rawmode, stride, orientation, bits in layout:
+        r0 = max(y0, top)
+        r1 = min(y1, bottom)
+        c0 = max(x0, left)
+        c1 = min(x1, right)
+        if r0 >= r1 or c0 >= c1:
+            continue
+        if orientation < 0:
+            # rows are stored bottom up
+            offset += (y1 - r1) * stride
+        else:
+            offset += (r0 - y0) * stride
+        offset += (c0 - x0) * bits // 8
+        tiles.append(('raw', (c0 - left, r0 - top, c1 - left, r1 - top),
+                      offset, (rawmode, stride, orientation)))
+
+    im = open_large(path)
+    if page:
+        im.seek(page)
+    im._size = (right - left, bottom - top)
+    im.tile = tiles
+    im.load()
+    return im
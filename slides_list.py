@@ -0,0 +1,146 @@
+"""
+program: slides_list.py
+
+purpose: For project slideshow.
+
+comments: A show's file list that stays small however long the show is.
+          Only the rows in view exist as canvas items; scrolling changes
+          their text instead of laying out a widget with a line for every
+          file, so a 100,000-file show scrolls like a 10-file one.
+
+history:
+-------
+10-18-2026  SlideList, for the file lists in slides_plot.
+"""
+import tkinter as tk
+from tkinter import ttk
+import tkinter.font as tkfont
+
+
+class SlideList(tk.Frame):
+    """Scrolling list of count rows, with one row highlighted.
+
+    label(n) returns the text of row n; it's only called for rows in view.
+    command(n), if given, is called when row n is clicked.
+
+    select(n) moves the highlight to row n. That's one item move, unless n
+    is out of view: then the list scrolls to it, which redraws the rows in
+    view. If the user has scrolled the highlighted row out of view, select
+    doesn't scroll back until they scroll to it again.
+    """
+    def __init__(self,
+                 master: object,
+                 count: int,
+                 label,
+                 rows: int=10,
+                 width: int=400,
+                 font: str='TkFixedFont',
+                 command=None,
+                 **kwargs
+                 ):
+        super().__init__(master, **kwargs)
+        self.count = count
+        self.label = label
+        self.rows = rows
+        self.command = command
+        self.top = 0
+        self.current = None
+
+        self._font = tkfont.nametofont(font)
+        self._row_ht = self._font.metrics('linespace') + 2
+        self._scroll = ttk.Scrollbar(self, orient='vertical', command=self.yview)
+        self._canv = tk.Canvas(self,
+                               width=width - self._scroll.winfo_reqwidth(),
+                               height=rows * self._row_ht,
+                               background='white',
+                               highlightthickness=0)
+        self._canv.pack(side='left', fill='both', expand=True)
+        self._scroll.pack(side='right', fill='y')
+
+        self._bar = self._canv.create_rectangle(0, 0, 0, 0,
+                                                fill='light blue',
+                                                outline='',
+                                                state='hidden')
+        self._items = [self._canv.create_text(4, r * self._row_ht + 1,
+                                              anchor='nw',
+                                              font=self._font,
+                                              text='')
+                       for r in range(rows)]
+
+        self._canv.bind('<Configure>', lambda ev: self._place_bar())
+        self._canv.bind('<Button-1>', self._on_click)
+        self._canv.bind('<MouseWheel>', self._on_wheel)
+        self._canv.bind('<Button-4>', lambda ev: self.yview('scroll', -3, 'units'))
+        self._canv.bind('<Button-5>', lambda ev: self.yview('scroll', 3, 'units'))
+
+        self._draw_rows()
+
+    def set_count(self, count: int) -> None:
+        """Change the number of rows, e.g. when files are added to the show."""
+        self.count = count
+        if self.current is not None and self.current >= count:
+            self.current = None
+        self._scroll_to(self.top, redraw=True)
+
+    def select(self, n: int | None) -> None:
+        """Highlight row n (None for no row), scrolling to it if it's out of view."""
+        following = self.current is None or self._in_view(self.current)
+        self.current = n
+        if n is not None and following and not self._in_view(n):
+            self._scroll_to(n - self.rows // 2)
+        else:
+            self._place_bar()
+
+    def refresh(self) -> None:
+        """Redraw the rows in view, e.g. after the labels have changed."""
+        self._draw_rows()
+
+    def yview(self, *args) -> None:
+        """Scroll the list; the scrollbar's command."""
+        if args[0] == 'moveto':
+            top = round(float(args[1]) * self.count)
+        elif args[2] == 'pages':
+            top = self.top + int(args[1]) * self.rows
+        else:
+            top = self.top + int(args[1])
+        self._scroll_to(top)
+
+    def _in_view(self, n: int) -> bool:
+        return self.top <= n < self.top + self.rows
+
+    def _scroll_to(self, top: int, redraw: bool=False) -> None:
+        top = max(0, min(top, self.count - self.rows))
+        if top != self.top or redraw:
+            self.top = top
+            self._draw_rows()
+
+    def _draw_rows(self) -> None:
+        for r, item in enumerate(self._items):
+            n = self.top + r
+            self._canv.itemconfigure(item, text=self.label(n) if n < self.count else '')
+        self._set_scrollbar()
+        self._place_bar()
+
+    def _set_scrollbar(self) -> None:
+        if self.count <= self.rows:
+            self._scroll.set(0.0, 1.0)
+        else:
+            self._scroll.set(self.top / self.count, (self.top + self.rows) / self.count)
+
+    def _place_bar(self) -> None:
+        if self.current is None or not self._in_view(self.current):
+            self._canv.itemconfigure(self._bar, state='hidden')
+            return
+
+        y = (self.current - self.top) * self._row_ht
+        width = max(self._canv.winfo_width(), int(self._canv.cget('width')))
+        self._canv.coords(self._bar, 0, y, width, y + self._row_ht)
+        self._canv.itemconfigure(self._bar, state='normal')
+
+    def _on_click(self, ev) -> None:
+        n = self.top + int(ev.y // self._row_ht)
+        if self.command is not None and n < self.count:
+            self.command(n)
+
+    def _on_wheel(self, ev) -> None:
+        self.yview('scroll', -3 if ev.delta > 0 else 3, 'units')
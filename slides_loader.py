@@ -0,0 +1,419 @@
+"""
+program: slides_loader.py
+
+purpose: For project slideshow.
+
+comments: Open, decode and resize image files for display. Nothing here
+          knows about Tk or matplotlib: the functions return PIL images
+          sized for a viewport, and the applications convert them.
+
+history:
+-------
+10-18-2026  Lazy, windowed decoding for slides_canvas.
+10-18-2026  Add Prefetcher: decode upcoming slides on worker threads.
+10-18-2026  load_slide can use a SlideCache.
+10-18-2026  load_slide can use a DiskCache.
+10-18-2026  Decode at the target size: JPEG draft(), reduce(), and a choice
+            of resampling quality.
+10-18-2026  Trace spans for each loading step (slides_trace).
+10-18-2026  Add ImageSource: full-size images opened only when needed,
+            with caps on open files and decoded bytes.
+10-18-2026  window_range can wrap around the end, for looping shows.
+10-18-2026  Very large images are decoded in bands or at reduced resolution
+            by slides_large, in load_slide and ImageSource.
+10-18-2026  ImageSource.images and set_max_bytes, for a memory budget.
+10-18-2026  decode_to_size converts palette, bilevel and 16-bit images before
+            reduce(), which can't take them.
+10-18-2026  ImageSource.paths.
+10-18-2026  load_slide and ImageSource open images over Pillow's decompression
+            bomb limit with slides_large.open_image, and decode them with
+            decode_region.
+10-18-2026  Slides are cached under their resampling quality too.
+"""
+from collections import OrderedDict
+from importlib.machinery import SourceFileLoader
+import heapq
+import itertools
+import os
+import queue
+import threading
+
+from PIL import Image
+
+import slides_cache
+import slides_large
+import slides_trace as trace
+
+cnv_ui = SourceFileLoader("cnv", "../canvas/canvas_ui.py").load_module()
+
+# resampling filter for the last step of each quality setting, and how far
+# above the target size integer reduce() must leave the image before it
+RESAMPLE = {'fast': (Image.Resampling.BILINEAR, 1),
+            'balanced': (Image.Resampling.BICUBIC, 2),
+            'best': (Image.Resampling.LANCZOS, 3)}
+
+
+def decode_to_size(im: Image.Image,
+                   size: tuple,
+                   quality: str='balanced'
+                   ) -> Image.Image:
+    """Decode an opened image straight to size, doing as little work as we can.
+
+    A JPEG is decoded at 1/2, 1/4 or 1/8 scale by draft() when that is
+    still at least size. Then reduce() takes the image down by a whole
+    factor, by averaging pixel blocks, while it stays more than the
+    quality's gap above size, and the quality's filter does the rest.
+    Palette, bilevel and 16-bit images are converted before reduce().
+    """
+    resample, gap = RESAMPLE[quality]
+    width, height = size
+
+    with trace.span('decode'):
+        if im.format == 'JPEG':
+            im.draft(im.mode, size)
+        im.load()
+
+    factor = min(im.width // (width * gap), im.height // (height * gap))
+    if factor >= 2:
+        with trace.span('reduce', factor=factor):
+            im = slides_large.reduce_image(im, factor)
+
+    with trace.span('resize'):
+        return im.resize(size, resample)
+
+
+def load_slide(path: str,
+               viewport: dict,
+               cache: object=None,
+               disk: object=None,
+               quality: str='balanced'
+               ) -> Image.Image | None:
+    """Open one image file and return a copy resized to fit the viewport.
+
+    With a slides_cache.SlideCache, a slide already made for this file,
+    viewport size and quality is returned from the cache, and a new one is added to it.
+    With a slides_cache.DiskCache, a slide saved by an earlier run is read
+    back instead of decoding the file, and a newly made one is saved.
+    quality is a key of RESAMPLE (see decode_to_size).
+
+    Returns None if the file can't be read, after printing the error, so a
+    bad file costs one slide rather than the whole show.
+    """
+    if cache is not None:
+        with trace.span('cache_get'):
+            im = cache.get(path, viewport, quality)
+        if im is not None:
+            return im
+
+    im_resize = None
+    if disk is not None:
+        with trace.span('disk_get'):
+            im_resize = disk.get(path, viewport, quality)
+
+    if im_resize is None:
+        try:
+            with trace.span('open'):
+                im = slides_large.open_image(path)
+            with im:
+                with trace.span('init_image_size'):
+                    imsize = cnv_ui.init_image_size(im, viewport)
+                size = (imsize['w'], imsize['h'])
+                if slides_large.is_large(im):
+                    with trace.span('decode_large'):
+                        im_resize = slides_large.decode_region(path, None, size, *RESAMPLE[quality])
+                else:
+                    im_resize = decode_to_size(im, size, quality)
+        except Exception as e:
+            print(f'error opening image: {str(e)}')
+            return None
+
+        if disk is not None:
+            with trace.span('disk_put'):
+                disk.put(path, viewport, im_resize, quality)
+
+    if cache is not None:
+        cache.put(path, viewport, im_resize, quality)
+
+    return im_resize
+
+
+def save_resized(path: str,
+                 im: Image.Image,
+                 viewport: dict,
+                 disk: object,
+                 quality: str='balanced'
+                 ) -> None:
+    """Resize an image that is already decoded and save it in a DiskCache.
+
+    For callers that display the full-size image themselves, so that the
+    next run can load the small one instead.
+    """
+    imsize = cnv_ui.init_image_size(im, viewport)
+    disk.put(path, viewport, decode_to_size(im, (imsize['w'], imsize['h']), quality), quality)
+
+
+class ImageSource:
+    """Full-size images, opened only when they are about to be shown.
+
+    open() reads just the file header and keeps the file open for a later
+    load(); at most max_open files are kept open this way, and the oldest
+    is closed to make room. load() decodes the whole image and closes its
+    file. Decoded images are kept, most recently used first, up to
+    max_bytes, and release() drops an image the caller is done with.
+    A very large image (see slides_large) is decoded only to fit within
+    large_size.
+
+    Errors are printed and give None, as in load_slide.
+    """
+    def __init__(self, max_open: int=16, max_bytes: int=256 * 2**20, large_size: tuple=(3840, 2160)):
+        self.max_open = max_open
+        self.max_bytes = max_bytes
+        self.large_size = large_size
+        self.nbytes = 0
+        self._open = OrderedDict()
+        self._loaded = OrderedDict()
+
+    def open(self, path: str) -> Image.Image | None:
+        """Return the image at path, opened but not decoded."""
+        if path in self._loaded:
+            return self._loaded[path][0]
+        if path in self._open:
+            self._open.move_to_end(path)
+            return self._open[path]
+
+        try:
+            with trace.span('open', file=os.path.basename(path)):
+                im = slides_large.open_image(path)
+        except Exception as e:
+            print(f'error opening image: {str(e)}')
+            return None
+
+        self._open[path] = im
+        while len(self._open) > self.max_open:
+            old_path, old = self._open.popitem(last=False)
+            old.close()
+
+        return im
+
+    def load(self, path: str) -> Image.Image | None:
+        """Return the decoded image at path; its file is closed."""
+        if path in self._loaded:
+            self._loaded.move_to_end(path)
+            return self._loaded[path][0]
+
+        im = self._open.pop(path, None)
+        if im is None:
+            im = self.open(path)
+            self._open.pop(path, None)
+        if im is None:
+            return None
+
+        try:
+            if slides_large.is_large(im):
+                with trace.span('decode_large', file=os.path.basename(path)):
+                    size = slides_large.fit(im.size, self.large_size)
+                    im.close()
+                    im = slides_large.decode_region(path, None, size)
+            else:
+                with trace.span('decode', file=os.path.basename(path)):
+                    im.load()
+        except Exception as e:
+            print(f'error opening image: {str(e)}')
+            im.close()
+            return None
+
+        if getattr(im, 'fp', None) is not None:
+            # multi-frame files keep their file open after load()
+            loaded = im.copy()
+            im.close()
+            im = loaded
+
+        size = slides_cache.image_bytes(im)
+        self._loaded[path] = (im, size)
+        self.nbytes += size
+        self._trim()
+
+        return im
+
+    def images(self) -> list:
+        """Return the decoded images held, oldest use first."""
+        return [im for im, size in self._loaded.values()]
+
+    def paths(self) -> list:
+        """Return the paths of the images held, open or decoded."""
+        return list(self._open) + list(self._loaded)
+
+    def set_max_bytes(self, max_bytes: int) -> None:
+        """Change the limit on decoded bytes; the newest image is always kept."""
+        self.max_bytes = max_bytes
+        self._trim()
+
+    def _trim(self) -> None:
+        while self.nbytes > self.max_bytes and len(self._loaded) > 1:
+            old_path, old = self._loaded.popitem(last=False)
+            self.nbytes -= old[1]
+
+    def release(self, path: str) -> None:
+        """Close and forget the image at path."""
+        im = self._open.pop(path, None)
+        if im is not None:
+            im.close()
+
+        entry = self._loaded.pop(path, None)
+        if entry is not None:
+            self.nbytes -= entry[1]
+
+    def close(self) -> None:
+        for im in self._open.values():
+            im.close()
+        self._open.clear()
+        self._loaded.clear()
+        self.nbytes = 0
+
+
+def window_range(current: int,
+                 count: int,
+                 ahead: int,
+                 behind: int,
+                 wrap: bool=False
+                 ) -> list:
+    """Return the slide indexes that should be decoded around current.
+
+    The current slide comes first, then the ones ahead of it in show order,
+    then the ones behind it, so that decoding in list order gets the next
+    slide ready before the previous one. With wrap, the window runs on
+    past the end to the first slides (and back past the first to the
+    last), as a looping show does.
+    """
+    if count == 0:
+        return []
+    current = max(0, min(current, count - 1))
+    if wrap:
+        wanted = [current]
+        for n in [current + k for k in range(1, ahead + 1)] + [current - k for k in range(1, behind + 1)]:
+            if n % count not in wanted:
+                wanted.append(n % count)
+        return wanted
+
+    wanted = [current]
+    wanted += range(current + 1, min(count, current + ahead + 1))
+    wanted += range(current - 1, max(-1, current - behind - 1), -1)
+
+    return wanted
+
+
+class Prefetcher:
+    """Decode slides on a pool of worker threads, nearest slide first.
+
+    Jobs wait in a bounded priority queue, and the lowest priority number is
+    taken first. When the queue is full a new job only gets in by pushing
+    out a job with a higher number.
+
+    Finished slides are collected with results(). Call it from the Tk thread
+    (from root.after, for instance), because that is the only place where a
+    PhotoImage may be created. cancel() drops every queued job, and any
+    result from a job that was started before the call.
+
+    cache, disk and quality are passed to load_slide.
+    """
+    def __init__(self,
+                 workers: int=2,
+                 maxsize: int=8,
+                 cache: object=None,
+                 disk: object=None,
+                 quality: str='balanced'
+                 ):
+        self.maxsize = maxsize
+        self.cache = cache
+        self.disk = disk
+        self.quality = quality
+        # heap entries: (priority, seq, generation, index, path, viewport)
+        self._jobs = []
+        self._pending = set()
+        self._done = queue.SimpleQueue()
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._generation = 0
+
+        for n in range(workers):
+            threading.Thread(target=self._work, name=f'prefetch-{n}', daemon=True).start()
+
+    def submit(self,
+               index: int,
+               path: str,
+               viewport: dict,
+               priority: int=0
+               ) -> bool:
+        """Queue slide index for decoding. Return False if the queue is full."""
+        with self._cond:
+            if index in self._pending:
+                return True
+
+            if len(self._jobs) >= self.maxsize:
+                worst = max(self._jobs)
+                if worst[0] <= priority:
+                    return False
+                self._jobs.remove(worst)
+                heapq.heapify(self._jobs)
+                self._pending.discard(worst[3])
+
+            job = (priority, next(self._seq), self._generation, index, path, dict(viewport))
+            heapq.heappush(self._jobs, job)
+            self._pending.add(index)
+            self._cond.notify()
+
+        return True
+
+    def retain(self, indexes) -> None:
+        """Drop queued jobs for slides that are not in indexes."""
+        keep = set(indexes)
+        with self._cond:
+            dropped = [job for job in self._jobs if job[3] not in keep]
+            if dropped:
+                self._jobs = [job for job in self._jobs if job[3] in keep]
+                heapq.heapify(self._jobs)
+                for job in dropped:
+                    self._pending.discard(job[3])
+
+    def cancel(self) -> None:
+        """Forget all queued and running jobs, e.g. when the file set changes."""
+        with self._cond:
+            self._generation += 1
+            self._jobs = []
+            self._pending = set()
+
+    def pending(self, index: int) -> bool:
+        """Return True if slide index is queued or being decoded."""
+        with self._cond:
+            return index in self._pending
+
+    def results(self) -> list:
+        """Return a list of (index, image) for slides finished since the last call.
+
+        image is None for a file that couldn't be read.
+        """
+        out = []
+        while True:
+            try:
+                generation, index, im = self._done.get_nowait()
+            except queue.Empty:
+                break
+
+            with self._cond:
+                if generation != self._generation:
+                    continue
+                self._pending.discard(index)
+            out.append((index, im))
+
+        return out
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                while not self._jobs:
+                    self._cond.wait()
+                priority, seq, generation, index, path, viewport = heapq.heappop(self._jobs)
+
+            with trace.span('load', slide=index, file=os.path.basename(path)):
+                im = load_slide(path, viewport, self.cache, self.disk, self.quality)
+            self._done.put((generation, index, im))
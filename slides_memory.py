@@ -0,0 +1,73 @@
+"""
+program: slides_memory.py
+
+purpose: For project slideshow.
+
+comments: A memory ceiling for the images an application holds. The
+          application registers pools (decoded PIL images, Tk PhotoImages,
+          matplotlib arrays, caches) as functions that return what each
+          pool holds now; MemoryBudget adds up their bytes, counting an
+          object held in two pools once, under the first. Deciding what to
+          evict when the total goes over the limit is left to the
+          application, which knows which slides are least useful.
+
+history:
+-------
+10-18-2026  MemoryBudget, photo_bytes and format_usage.
+"""
+import slides_cache
+
+
+def photo_bytes(photo: object) -> int:
+    """Return the size of a Tk PhotoImage's pixel data; Tk keeps 4 bytes a pixel."""
+    return photo.width() * photo.height() * 4
+
+
+def array_bytes(a: object) -> int:
+    return a.nbytes
+
+
+class MemoryBudget:
+    """Add up the image data an application holds, against limit bytes.
+
+    track(name, objects, size) registers a pool: objects() returns what
+    the pool holds now and size(obj) the bytes of one. usage() measures
+    every pool, so it costs one call per object; pools should be the
+    small, current sets (a show's window, a cache), not whole playlists.
+    """
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.peak = 0
+        self.evictions = 0
+        self._pools = []
+
+    def track(self, name: str, objects, size=slides_cache.image_bytes) -> None:
+        self._pools.append((name, objects, size))
+
+    def usage(self) -> dict:
+        """Return the bytes held in each pool, and note the peak total."""
+        seen = set()
+        usage = {}
+        for name, objects, size in self._pools:
+            total = 0
+            for obj in objects():
+                if id(obj) not in seen:
+                    seen.add(id(obj))
+                    total += size(obj)
+            usage[name] = total
+
+        self.peak = max(self.peak, sum(usage.values()))
+        return usage
+
+    def over(self, usage: dict) -> int:
+        """Return how many bytes usage is over the limit (negative if under)."""
+        return sum(usage.values()) - self.limit
+
+
+def format_usage(usage: dict, limit: int, peak: int | None=None) -> str:
+    """Return a one-line summary of usage() in MB."""
+    pools = ', '.join(f'{name} {nbytes / 2**20:.0f}' for name, nbytes in usage.items())
+    text = f'memory {sum(usage.values()) / 2**20:.0f} of {limit / 2**20:.0f} MB ({pools})'
+    if peak is not None:
+        text += f', peak {peak / 2**20:.0f} MB'
+    return text
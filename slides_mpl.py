@@ -0,0 +1,95 @@
+"""
+program: slides_mpl.py
+
+purpose: For project slideshow.
+
+comments: Fast drawing of slides in a matplotlib figure. Instead of clf()
+          and imshow() for every slide, a figure keeps one Axes, one image
+          artist and one title, and each slide only changes their data and
+          text. Where the backend can blit, a slide is drawn by restoring
+          the saved background and drawing those two artists.
+
+history:
+-------
+10-18-2026  init_fast_render and render_image, for slides_plot.
+10-18-2026  render_image scales 16-bit images to 8 bits instead of clipping them.
+"""
+import numpy as np
+from PIL import Image
+
+import slides_cache
+
+
+def init_fast_render(fig: object) -> dict:
+    """Set up the Axes, image and title that render_image reuses.
+
+    Where the backend can blit, the image and title are animated artists:
+    a full draw (the first one, or after a resize) saves the background
+    and draws them on it.
+
+    Returns a dict of the artists, to be passed to render_image.
+    """
+    blit = fig.canvas.supports_blit
+    ax = fig.add_subplot()
+    ax.axis("off")
+    artist = ax.imshow(np.zeros((1, 1, 3), dtype=np.uint8), animated=blit)
+    title = ax.set_title('', animated=blit)
+    view = {'fig': fig, 'ax': ax, 'artist': artist, 'title': title,
+            'background': None, 'blit': blit}
+
+    def on_draw(ev):
+        view['background'] = fig.canvas.copy_from_bbox(fig.bbox)
+        ax.draw_artist(artist)
+        ax.draw_artist(title)
+
+    if blit:
+        fig.canvas.mpl_connect('draw_event', on_draw)
+
+    return view
+
+
+def render_image(view: dict,
+                 im: Image.Image | None,
+                 text: str,
+                 draw_now: bool=False
+                 ) -> None:
+    """Show im, with text as its title, in a figure set up by init_fast_render.
+
+    im should already be about the size of the figure in pixels; None
+    shows an empty slide. Images that aren't RGB or RGBA are converted to
+    RGB, so that every slide goes through the same path (no colour map);
+    16-bit images are scaled to 8 bits first (slides_cache.to_8bit).
+
+    Until the first full draw has saved a background, or if the backend
+    can't blit, the figure is drawn when Tk is idle, or at once if
+    draw_now.
+    """
+    fig = view['fig']
+    ax = view['ax']
+    artist = view['artist']
+
+    if im is None:
+        im = Image.new('RGB', (1, 1))
+    elif im.mode not in ('RGB', 'RGBA'):
+        im = slides_cache.to_8bit(im).convert('RGB')
+
+    data = np.asarray(im)
+    height, width = data.shape[:2]
+    artist.set_data(data)
+    artist.set_extent((-0.5, width - 0.5, height - 0.5, -0.5))
+    ax.set_xlim(-0.5, width - 0.5)
+    ax.set_ylim(height - 0.5, -0.5)
+    view['title'].set_text(text)
+
+    canvas = fig.canvas
+    if view['blit'] and view['background'] is not None:
+        canvas.restore_region(view['background'])
+        # draw_artist doesn't apply the aspect ratio the way draw() does
+        ax.apply_aspect()
+        ax.draw_artist(artist)
+        ax.draw_artist(view['title'])
+        canvas.blit(fig.bbox)
+    elif draw_now:
+        canvas.draw()
+    else:
+        canvas.draw_idle()
@@ -0,0 +1,416 @@
+"""
+program: slides_playlist.py
+
+purpose: For project slideshow.
+
+comments: A compact store for long playlists. Instead of a list of full
+          path strings, each folder is kept once in a table and each entry
+          is a folder number plus the offset of its file name in one
+          shared byte buffer, all in arrays: 34 bytes per entry (16 for
+          the name, 18 for the image metadata) plus the file name, so
+          about 50 for a camera file name like IMG_0001.JPG, against a
+          hundred or more for a path string in a list. Shuffled order adds
+          a few hundred bytes per segment, not per entry.
+
+          Shuffled play goes through Shuffle, which maps a play position to
+          an entry with a keyed permutation; no shuffled copy of the
+          playlist is made. Entries added to a shuffled playlist get a
+          permutation of their own, after the positions already handed
+          out, so a growing playlist (a folder still being scanned) keeps
+          the order it has played so far.
+
+          A playlist can be saved with its image metadata (modification
+          time, size in pixels, EXIF orientation and format) as JSON lines,
+          and loaded again without opening any image. Saving again probes
+          only the files whose modification time has changed. The
+          applications don't use the metadata themselves; it is there for
+          info() and for tools that read the saved file.
+
+history:
+-------
+10-18-2026  Playlist and Shuffle.
+10-18-2026  Per-entry metadata; save_playlist and load_playlist.
+10-18-2026  entry() is public, for removing by play position.
+10-18-2026  Appending to a shuffled playlist keeps the order of the positions
+            already there; the new entries are shuffled after them. Saved
+            playlists keep the segments.
+10-18-2026  save_in_background saves a copy of the playlist, and
+            save_playlist probes only new and changed files.
+10-18-2026  probe() reads gigapixel images too (slides_large.open_image).
+10-18-2026  Correct the bytes per entry in the comments.
+"""
+import array
+import bisect
+import json
+import os
+import random
+import threading
+
+import slides_large
+
+# file name suffix of saved playlists
+PLAYLIST_SUFFIX = '.slides'
+PLAYLIST_VERSION = 1
+# EXIF tag for the orientation of the camera
+ORIENTATION = 0x0112
+
+
+def probe(path: str) -> tuple | None:
+    """Return (mtime_ns, width, height, orientation, format) of an image file.
+
+    Only the file header is read. Returns None if the file can't be read.
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+        with slides_large.open_image(path) as im:
+            orientation = im.getexif().get(ORIENTATION, 1)
+            return (mtime, im.width, im.height, orientation, im.format or '')
+    except Exception as e:
+        print(f'error opening image: {str(e)}')
+        return None
+
+
+class Shuffle:
+    """A random permutation of range(count), computed one position at a time.
+
+    shuffle[i] is the entry played at position i. Every entry comes up
+    exactly once. The permutation is a small Feistel network over the
+    smallest power of 4 that is at least count; results outside the range
+    are fed back in until one lands inside (cycle walking), which takes
+    fewer than 4 rounds on average. Memory use doesn't depend on count.
+    """
+    rounds = 4
+
+    def __init__(self, count: int, seed: int | None=None):
+        self.count = count
+        self.seed = random.randrange(2**32) if seed is None else seed
+        self._half = max(1, (max(count, 2) - 1).bit_length() + 1) // 2
+        self._mask = (1 << self._half) - 1
+        rand = random.Random(self.seed)
+        self._keys = [rand.getrandbits(32) for n in range(self.rounds)]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, i: int) -> int:
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError('shuffle position out of range')
+
+        x = self._permute(i)
+        while x >= self.count:
+            x = self._permute(x)
+        return x
+
+    def _permute(self, x: int) -> int:
+        half = self._half
+        mask = self._mask
+        left = x >> half
+        right = x & mask
+        for key in self._keys:
+            mixed = ((right ^ key) * 0x45d9f3b) & 0xffffffff
+            mixed ^= mixed >> 16
+            left, right = right, left ^ (mixed & mask)
+        return (left << half) | right
+
+
+class Playlist:
+    """Image paths, stored compactly, in play order.
+
+    playlist[i] is the path played at position i: entry i, or with
+    shuffle on, the entry Shuffle gives for i. A shuffled playlist is cut
+    into segments, each with its own Shuffle: the first lookup of a
+    position past the last segment makes a new one, of all the entries
+    from there to the end. So append() and extend() leave every position
+    in place, and the new entries are shuffled among themselves after the
+    old ones; insert(), pop() and set_shuffle() reshuffle the whole list.
+
+    Each entry can also hold its image metadata (see probe and info);
+    until it has been probed, an entry's width is 0.
+    """
+    def __init__(self, paths=(), shuffle: bool=False, seed: int | None=None):
+        self._folders = []
+        self._folder_ids = {}
+        # per entry: folder number, and start and length of the name in _names
+        self._folder = array.array('I')
+        self._start = array.array('Q')
+        self._length = array.array('I')
+        self._names = bytearray()
+        # metadata per entry; format is a number in _formats
+        self._mtime = array.array('q')
+        self._width = array.array('I')
+        self._height = array.array('I')
+        self._orientation = array.array('B')
+        self._format = array.array('B')
+        self._formats = ['']
+        # shuffled order: the end position of each segment, and its Shuffle
+        self._ends = []
+        self._orders = []
+        self._seed = seed
+        self._shuffled = shuffle
+
+        self.extend(paths)
+
+    def __len__(self) -> int:
+        return len(self._folder)
+
+    def __getitem__(self, i: int) -> str:
+        return self._path(self.entry(i))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def shuffled(self) -> bool:
+        return self._shuffled
+
+    def name(self, i: int) -> str:
+        """Return the file name of the path at position i."""
+        return self._name(self.entry(i))
+
+    def info(self, i: int) -> dict | None:
+        """Return the metadata of the image at position i, or None if not probed."""
+        k = self.entry(i)
+        if not self._width[k]:
+            return None
+        return {'mtime_ns': self._mtime[k],
+                'width': self._width[k],
+                'height': self._height[k],
+                'orientation': self._orientation[k],
+                'format': self._formats[self._format[k]]}
+
+    def append(self, path: str, meta: tuple | None=None) -> None:
+        """Add path at the end; meta is as returned by probe()."""
+        folder, name = os.path.split(path)
+        folder_id = self._folder_ids.get(folder)
+        if folder_id is None:
+            folder_id = len(self._folders)
+            self._folders.append(folder)
+            self._folder_ids[folder] = folder_id
+
+        data = os.fsencode(name)
+        self._folder.append(folder_id)
+        self._start.append(len(self._names))
+        self._length.append(len(data))
+        self._names += data
+        for column in self._meta_columns():
+            column.append(0)
+        if meta is not None:
+            self._set_meta(len(self) - 1, meta)
+
+    def extend(self, paths) -> None:
+        for path in paths:
+            self.append(path)
+
+    def copy(self) -> 'Playlist':
+        """Return a copy, which another thread can use while this one changes."""
+        other = Playlist(shuffle=self._shuffled, seed=self._seed)
+        other._folders = list(self._folders)
+        other._folder_ids = dict(self._folder_ids)
+        for name in ('_folder', '_start', '_length', '_mtime', '_width', '_height',
+                     '_orientation', '_format'):
+            setattr(other, name, getattr(self, name)[:])
+        other._names = bytearray(self._names)
+        other._formats = list(self._formats)
+        other._ends = list(self._ends)
+        other._orders = list(self._orders)
+        return other
+
+    def insert(self, i: int, path: str) -> None:
+        """Put path in entry i, moving the entries from i on up by one."""
+        self.append(path)
+        for column in self._columns():
+            column.insert(i, column.pop())
+        self._set_segments([])
+
+    def pop(self, i: int=-1) -> str:
+        """Remove entry i and return its path.
+
+        The file name stays in the name buffer; compact() reclaims it.
+        """
+        path = self._path(i)
+        for column in self._columns():
+            column.pop(i)
+        self._set_segments([])
+        return path
+
+    def compact(self) -> None:
+        """Rebuild the name buffer without the names of removed entries."""
+        names = bytearray()
+        for k in range(len(self)):
+            start = self._start[k]
+            self._start[k] = len(names)
+            names += self._names[start:start + self._length[k]]
+        self._names = names
+
+    def set_shuffle(self, on: bool, seed: int | None=None) -> None:
+        """Turn shuffled order on or off; a new seed gives a new order."""
+        self._shuffled = on
+        if seed is not None:
+            self._seed = seed
+        self._set_segments([])
+
+    def probe(self, entries=None, stop: threading.Event | None=None) -> None:
+        """Read the metadata of entries (entry numbers, not play positions).
+
+        The default is every entry that hasn't been probed. An entry whose
+        file can't be read is left unprobed. Setting stop ends the probing.
+        """
+        if entries is None:
+            entries = [k for k in range(len(self)) if not self._width[k]]
+        for k in entries:
+            if stop is not None and stop.is_set():
+                return
+            meta = probe(self._path(k))
+            if meta is None:
+                self._width[k] = 0
+            else:
+                self._set_meta(k, meta)
+
+    def stale(self) -> list:
+        """Return the entries whose file has changed or gone since it was probed."""
+        changed = []
+        for k in range(len(self)):
+            try:
+                mtime = os.stat(self._path(k)).st_mtime_ns
+            except OSError:
+                mtime = None
+            if mtime != self._mtime[k] or not self._width[k]:
+                changed.append(k)
+        return changed
+
+    def nbytes(self) -> int:
+        """Return the approximate memory used by the entries, not the folders."""
+        return sum(column.itemsize * len(column) for column in self._columns()) + len(self._names)
+
+    def _columns(self) -> tuple:
+        return (self._folder, self._start, self._length) + self._meta_columns()
+
+    def _meta_columns(self) -> tuple:
+        return (self._mtime, self._width, self._height, self._orientation, self._format)
+
+    def _set_meta(self, k: int, meta: tuple) -> None:
+        mtime, width, height, orientation, fmt = meta
+        if fmt not in self._formats:
+            self._formats.append(fmt)
+        self._mtime[k] = mtime
+        self._width[k] = width
+        self._height[k] = height
+        self._orientation[k] = orientation if 0 <= orientation < 256 else 1
+        self._format[k] = self._formats.index(fmt)
+
+    def _path(self, k: int) -> str:
+        return os.path.join(self._folders[self._folder[k]], self._name(k))
+
+    def entry(self, i: int) -> int:
+        """Return the entry number of position i (they differ when shuffled)."""
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('playlist index out of range')
+        if not self._shuffled:
+            return i
+
+        if not self._ends or i >= self._ends[-1]:
+            self._add_segment(len(self))
+        j = bisect.bisect_right(self._ends, i)
+        start = self._ends[j - 1] if j else 0
+        return start + self._orders[j][i - start]
+
+    def _set_segments(self, ends: list) -> None:
+        """Start the shuffled order again, with segments ending at the positions in ends."""
+        self._ends = []
+        self._orders = []
+        for end in ends:
+            self._add_segment(end)
+
+    def _add_segment(self, end: int) -> None:
+        """Shuffle the positions from the last segment's end to end, with a seed of their own."""
+        if self._seed is None:
+            self._seed = random.randrange(2**32)
+        start = self._ends[-1] if self._ends else 0
+        self._orders.append(Shuffle(end - start, self._seed + len(self._orders)))
+        self._ends.append(end)
+
+    def _name(self, k: int) -> str:
+        start = self._start[k]
+        return os.fsdecode(bytes(self._names[start:start + self._length[k]]))
+
+
+def save_playlist(playlist: Playlist, path: str, stop: threading.Event | None=None) -> None:
+    """Write playlist, with the metadata of every entry, to path.
+
+    Entries that haven't been probed, or whose file has changed since, are
+    probed first, so this can take a while for a new playlist; run it off
+    the Tk thread, on a playlist nothing else is changing (see
+    save_in_background). The file is JSON lines: a header, then [path,
+    mtime_ns, width, height, orientation, format] for each entry, in entry
+    order.
+    """
+    playlist.probe(playlist.stale(), stop=stop)
+    if stop is not None and stop.is_set():
+        return
+
+    header = {'playlist': PLAYLIST_VERSION,
+              'count': len(playlist),
+              'shuffle': playlist.shuffled,
+              'seed': playlist._seed,
+              'segments': playlist._ends}
+    tmpname = path + '.tmp'
+    with open(tmpname, 'w', encoding='utf-8', errors='surrogateescape') as f:
+        f.write(json.dumps(header) + '\n')
+        for k in range(len(playlist)):
+            fmt = playlist._formats[playlist._format[k]]
+            f.write(json.dumps([playlist._path(k), playlist._mtime[k], playlist._width[k],
+                                playlist._height[k], playlist._orientation[k], fmt]) + '\n')
+    os.replace(tmpname, path)
+
+
+def load_playlist(path: str, check: bool=True) -> Playlist:
+    """Read a playlist written by save_playlist.
+
+    No image is opened, except that with check, files whose modification
+    time has changed are probed again (one stat per entry), which can take
+    a while. Without check the metadata is as saved; save_playlist brings
+    it up to date.
+    """
+    with open(path, encoding='utf-8', errors='surrogateescape') as f:
+        header = json.loads(f.readline())
+        if header.get('playlist') != PLAYLIST_VERSION:
+            raise ValueError(f'not a version {PLAYLIST_VERSION} playlist: {path}')
+
+        playlist = Playlist(shuffle=header.get('shuffle', False), seed=header.get('seed'))
+        for line in f:
+            entry = json.loads(line)
+            playlist.append(entry[0], tuple(entry[1:]))
+        ends = header.get('segments', [])
+        if ends and ends[-1] <= len(playlist):
+            playlist._set_segments(ends)
+
+    if check:
+        playlist.probe(playlist.stale())
+
+    return playlist
+
+
+def save_in_background(playlist: Playlist, path: str) -> threading.Thread:
+    """Run save_playlist on a thread, and print when it's done.
+
+    The thread saves a copy of playlist, taken here, so the caller can go
+    on changing playlist (a show growing or being edited) meanwhile.
+    """
+    playlist = playlist.copy()
+
+    def save():
+        try:
+            save_playlist(playlist, path)
+        except (OSError, ValueError) as e:
+            print(f'error saving playlist: {str(e)}')
+            return
+        print(f'playlist of {len(playlist)} saved to {path}')
+
+    thread = threading.Thread(target=save, name='save-playlist', daemon=True)
+    thread.start()
+    return thread
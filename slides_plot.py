@@ -25,17 +25,94 @@ history:
             New logic for resuming a paused show: add flag to display_slides.
 04-17-2026  Debug pause/resume when there are multiple shows.
 04-22-2026  Debug restart of the show.
+10-18-2026  Run each show from after() timers (slides_sched) instead of a
+            plt.pause loop. Pause, resume and restart act on the most recent
+            show that is still open; closing a figure stops its show.
+10-18-2026  Slides are due at fixed times from the start of the show;
+            timing stats are printed when it ends.
+10-18-2026  Keep each show in a slides_state.Slideshow instead of the
+            images_opened / images_selected / image_objects globals. Add
+            keyboard seeking in the most recent show: Ctrl-Right/Left,
+            Ctrl-Home/End, and Ctrl-g to go to a slide number.
+10-18-2026  Decoded images are kept in an LRU cache (slides_cache), so
+            restarting a show or opening the same files again doesn't read
+            them from disk again.
+10-18-2026  Figure-sized copies of the images are saved to a disk cache,
+            and setup_plot loads those when they are there.
+10-18-2026  Trace spans for opening, imshow and drawing; set
+            SLIDES_TRACE=trace.json to record them (see slides_trace).
+10-18-2026  Add fast_render: each figure keeps one Axes, image and title,
+            updated with set_data / set_text and redrawn by blitting, and
+            slides are resized to the figure before they are shown.
+10-18-2026  setup_plot no longer opens every file. Images are opened when
+            their slide comes up and closed after, through
+            slides_loader.ImageSource, which caps open files and decoded
+            bytes.
+10-18-2026  All shows run on one slides_sched.SharedTimer, earliest
+            deadline first, and with fast_render their slides are decoded
+            and resized on one shared pool of threads (decode_pool). Pause,
+            resume, restart, delay and seeking act on the active show: the
+            one whose figure or file list was last entered or clicked.
+10-18-2026  The file list of each show is a slides_list.SlideList, which
+            only draws the rows in view, instead of a Text with a line per
+            slide shown. The current slide is highlighted, and clicking a
+            row goes to that slide.
+10-18-2026  Add Open Folder: a show of the images in a folder, optionally
+            with its subfolders, starts on the first one found while a
+            slides_source.FolderScan adds the rest in the background.
+10-18-2026  Each show's playlist is a compact slides_playlist.Playlist; add
+            shuffle and repeat.
+10-18-2026  Save the active show's playlist, with image metadata, with
+            Ctrl-s; a saved playlist (.slides) opens through Open Files
+            without opening the images.
+10-18-2026  Image catalog (slides_catalog): Ctrl-i indexes a folder in the
+            background, Ctrl-f starts a show of the images matching a query.
+10-18-2026  With fast_render, optional crossfade, slide or wipe transitions
+            between slides (slides_transition), run on the shared timer.
+10-18-2026  With fast_render, animated GIF, APNG and WebP slides play:
+            slides_anim streams their frames from the file while the slide
+            is on screen.
+10-18-2026  Optional memory ceiling (memory_mb): the bytes of decoded
+            slides, matplotlib's image arrays and the caches are added up by
+            slides_memory, and the caches shrink to stay under it. The
+            figures are printed when they do, and with the timing stats.
+10-18-2026  Files that can't be read are left out of the show instead of
+            being shown as an empty slide.
+10-18-2026  Without fast_render, figure-sized copies are read from the disk
+            cache again, and full-size images are kept only by image_source.
+10-18-2026  A saved playlist is opened without checking its files; saving
+            copies the playlist first.
+10-18-2026  The classic path reads cached slides made at resample_quality only.
+10-18-2026  Without fast_render, the file released after a slide is the one shown
+            before it, which after a seek or when shuffled isn't slide n - 1.
+10-18-2026  The memory budget counts the frames animations hold.
 """
 import tkinter as tk
-from tkinter import ttk, filedialog
+from tkinter import ttk, filedialog, messagebox, simpledialog
 from importlib.machinery import SourceFileLoader
-import time
+import itertools
+import os
+import threading
 import tkinter.font as tkfont
 
 from ttkthemes import ThemedTk
 from PIL import Image
 import matplotlib.pyplot as plt
 
+import slides_anim
+import slides_cache
+import slides_catalog
+import slides_list
+import slides_loader
+import slides_memory
+import slides_mpl
+import slides_playlist
+import slides_sched
+import slides_source
+import slides_state
+import slides_trace as trace
+import slides_transition
+
 # ? attempt to retain focus; what does this do to the pause/resume
 plt.rcParams["figure.raise_window"]=False
 
@@ -49,6 +126,58 @@ root.title("canvas, ttk, pack")
 
 # ? can all of these vars be moved below the function defs
 delay_time = 3
+# drop a slide that isn't ready when the next one is due
+skip_late_slides = False
+# size limit for decoded images kept for the next show of the same files
+cache_mb = 512
+# figure-sized copies of the images are saved here for the next run; None
+# turns this off
+disk_cache_dir = os.path.join(os.path.expanduser('~'), '.cache', 'slideshow')
+disk_cache_mb = 1024
+# 'fast', 'balanced' or 'best' (see slides_loader.RESAMPLE)
+resample_quality = 'balanced'
+# reuse one image and title artist per figure, with images resized to the
+# figure, instead of clf() and imshow() of the full-size image every slide
+fast_render = True
+# without fast_render, slides are the figure-sized copies in disk_cache_dir
+# where there are any, or else full-size images from image_source: at most
+# max_open_files are open at once, and at most source_mb of decoded images
+# are kept
+max_open_files = 16
+source_mb = 256
+# with fast_render, slides are decoded on this many threads shared by all
+# shows, at most decode_queue waiting; finished ones are collected every
+# decode_poll_ms
+decode_workers = 4
+decode_queue = 32
+decode_poll_ms = 20
+# rows shown in each show's file list; longer lists scroll
+list_rows = 12
+# Open Folder plays the files whose names match one of folder_patterns; the
+# files found since are added to the show every scan_poll_ms
+folder_patterns = slides_source.IMAGE_PATTERNS
+scan_poll_ms = 100
+# play each show in a random order; repeat is 'off', 'all' to loop the
+# show or 'one' to keep showing the same slide
+shuffle = False
+repeat = 'off'
+# the image catalog (see slides_catalog): Ctrl-i indexes a folder into it,
+# Ctrl-f finds images in it and starts a show of them
+catalog_file = os.path.join(os.path.expanduser('~'), '.cache', 'slideshow_catalog.sqlite')
+# transition between slides with fast_render: 'none', 'crossfade', 'slide'
+# or 'wipe', lasting transition_ms at up to transition_fps frames a second
+transition = 'none'
+transition_ms = 400
+transition_fps = 30
+# with fast_render, play animated GIF, APNG and WebP files during their
+# slide, holding at most animation_ahead decoded frames
+animate = True
+animation_ahead = 4
+# a ceiling, in MB, on the image data held by all shows: decoded slides,
+# the arrays matplotlib draws from, slide_cache and image_source (see
+# slides_memory); None for no ceiling. Each show holds only the slide on
+# screen and the next one, so the caches give way.
+memory_mb = None
 
 helv12 = tkfont.Font(family='Helvetica', size=12)
 helv12b = tkfont.Font(family='Helvetica', size=12, weight='bold')
@@ -65,18 +194,124 @@ def reset_window_size(canv: object, vp: dict) -> None:
 
 
 def select_image_files(canv: object) -> None:
-    if run_status is True:
+    show = active_show()
+    if show is None or show.status != 'paused':
         file_path = filedialog.askopenfilenames(title="Select Images for Display",
                                                 initialdir="images",
                                                 filetypes=[("Png files", "*.png"),
                                                            ("Jpeg files", "jpg"),
+                                                           ("Playlists", "*" + slides_playlist.PLAYLIST_SUFFIX),
                                                            ("All files", "*.*")]
                                                 )
-        if file_path:
+        if len(file_path) == 1 and file_path[0].endswith(slides_playlist.PLAYLIST_SUFFIX):
+            open_playlist(file_path[0])
+        elif file_path:
             setup_plot(file_path)
 
 
-def setup_plot(fpath: tuple | str) -> None:
+def open_playlist(path: str) -> None:
+    """Start a show of a playlist saved by save_show."""
+    try:
+        playlist = slides_playlist.load_playlist(path, check=False)
+    except (OSError, ValueError) as e:
+        print(f'error opening playlist: {str(e)}')
+        return
+
+    setup_plot(playlist)
+
+
+def save_show(ev=None) -> None:
+    """Save the active show's playlist, with the size and format of each image.
+
+    The playlist is copied, and images that haven't been probed yet, or
+    have changed since, are read on a background thread.
+    """
+    show = active_show()
+    if show is None or not len(show):
+        return
+
+    path = filedialog.asksaveasfilename(title="Save Playlist",
+                                        initialdir="images",
+                                        defaultextension=slides_playlist.PLAYLIST_SUFFIX,
+                                        filetypes=[("Playlists", "*" + slides_playlist.PLAYLIST_SUFFIX)])
+    if path:
+        slides_playlist.save_in_background(show.paths, path)
+
+
+def index_folder(ev=None) -> None:
+    """Add a folder's images to the catalog, on a background thread."""
+    folder = filedialog.askdirectory(title="Select Folder to Index", initialdir="images")
+    if not folder:
+        return
+
+    recursive = messagebox.askyesno('Index Folder', 'Include subfolders?')
+    indexer = slides_catalog.Indexer(catalog_file, folder, recursive, folder_patterns)
+    root.after(500, poll_indexer, indexer)
+
+
+def poll_indexer(indexer: object) -> None:
+    if indexer.done:
+        print('catalog: ' + indexer.summary())
+    else:
+        root.after(500, poll_indexer, indexer)
+
+
+def find_slides(ev=None) -> None:
+    """Ask for a catalog query, and play the images that match.
+
+    Uses module variables:
+        catalog -- connection to the catalog database, opened when first used
+    """
+    global catalog
+
+    query = slides_catalog.QueryDialog(root, 'Find Images').result
+    if query is None:
+        return
+
+    if catalog is None:
+        catalog = slides_catalog.connect(catalog_file)
+    playlist = slides_catalog.find(catalog, **query)
+    print(f'{len(playlist)} images found')
+    if len(playlist):
+        setup_plot(playlist)
+
+
+def select_folder(canv: object) -> None:
+    """Start a show of the images in a folder, as soon as the first is found."""
+    show = active_show()
+    if show is not None and show.status == 'paused':
+        return
+
+    folder = filedialog.askdirectory(title="Select Image Folder", initialdir="images")
+    if not folder:
+        return
+
+    recursive = messagebox.askyesno('Open Folder', 'Include subfolders?')
+    setup_plot((), slides_source.FolderScan(folder, recursive, folder_patterns))
+
+
+def poll_scans() -> None:
+    """Add the files found by folder scans to their shows.
+
+    Runs on the Tk thread every scan_poll_ms.
+    """
+    for show in figure_shows.values():
+        scan = show.view.get('scan')
+        if scan is None:
+            continue
+
+        paths = scan.take()
+        if paths or scan.finished:
+            show.extend(paths, more_coming=not scan.finished)
+            show.view['list'].set_count(len(show))
+        if scan.finished:
+            print(f'{scan.found} images found in {scan.folder}')
+            show.view['scan'] = None
+
+    root.after(scan_poll_ms, poll_scans)
+
+
+def setup_plot(fpath: tuple | str, scan: object=None) -> None:
     """Display a sequence of images using matplotlib.
 
     Uses module variables:
@@ -89,19 +324,15 @@ def setup_plot(fpath: tuple | str) -> None:
            There is currently no code to do this.
         2. The figure object is only needed to suppress the window UI widgets
            using pack_forget().
-        3. This method does not support the 'with' context manager for reading files.
+        3. No file is opened here. Each image is opened by image_source, or
+           load_slide, when its slide comes up, and closed after.
         4. This method is easier for +1 independent slideshow (using different figures).
+        5. With a FolderScan, fpath is normally empty, and poll_scans adds
+           the files to the show as they are found.
     """
-    global image_objects
-    global images_opened
-    global run_status
     global canv_1
     global list_frames
 
-    # re-init globals
-    image_objects = []
-    images_opened = []
-
     if isinstance(fpath, str):
         print('converting path string to tuple...')
         fpath = (fpath,)
@@ -127,96 +358,360 @@ def setup_plot(fpath: tuple | str) -> None:
     # nam = 'list' + str(figures[-1])
     # disp_nam = 'list ' + str(figures[-1])
 
-    for n, item in enumerate(fpath):
-        try:
-            im = Image.open(item)
-            images_opened.append(item)
-            image_objects.append(im)
-        except Exception as e:
-            print(f'error opening image: {str(e)}')
+    # files are opened when their slide is about to be shown
+    fig_vp = figure_viewport(fig)
+    show = slides_state.Slideshow(fpath, shuffle)
 
-    num_to_show = len(images_opened)
+    num_to_show = len(show)
 
     fr = tk.Frame(canv_1, width=400)
     list_label = tk.Label(fr, text=figure_text, background='cyan')
     list_label.pack(anchor='w')
+    for widget in (fr, list_label):
+        widget.bind('<Button-1>', lambda ev, num=fig.number: set_active(num))
 
-    t1 = tk.Text(fr, height=num_to_show)
-    t1.pack(anchor='w')
+    # only the rows in view are drawn, however many files there are
+    files = slides_list.SlideList(fr,
+                                  num_to_show,
+                                  lambda n: str(n + 1) + ': ' + show.name(n),
+                                  rows=list_rows if scan else min(list_rows, max(1, num_to_show)),
+                                  command=lambda n, num=fig.number: seek_show(num, n))
+    files.pack(anchor='w')
 
     list_frames.append(fr)
+    show.view = {'fig': fig, 'frame': fr, 'label': list_label, 'list': files,
+                 'viewport': fig_vp, 'saved': set(), 'serial': next(show_serials),
+                 'scan': scan, 'shown_path': None}
+    fig.canvas.mpl_connect('figure_enter_event', lambda ev: set_active(ev.canvas.figure.number))
+    if fast_render:
+        show.view.update(slides_mpl.init_fast_render(fig))
 
-    display_slides(fr, 0)
+    fig.show()
+    display_slides(show)
 
 
-def display_slides(fr: object,
-                   startnum=0,
-                   resume=False,
-                   restart=False) -> None:
-    # since this will be used for initial display, and add_to_slides will be
-    # used to resume the paused show, startnum here can be assumed to be 0 (?).
+def display_slides(show: object, startnum=0) -> None:
+    """Place the file list for a new show, and start the show.
 
-    # need fewer globals, or more parameters, or some other way...
-    global image_objects
-    global images_opened
-    global images_selected
-    global run_status
-    global canv_windows
-    global canv_1
+    The show runs from a SlideScheduler on the shared timer, so this
+    returns right away and several figures can play at once, each with its
+    own delay, position and status.
 
+    Uses module variables:
+        canv_windows
+        canv_1
+        figure_shows -- dict of figure number: Slideshow
+        delay_time
+        timer
+    """
     print('in display_slides')
     print(f'    {startnum=}')
     root.focus()
 
-    # print(f'    {resume=}')
-    t1 = fr.winfo_children()[1]
-    if restart is True:
-        # print('restart')
-        # print(f'{t1['state']=}')
-        # t1.config(state='normal')
-        # print(f'{t1['state']=}')
-        t1.delete('1.0', 'end')
+    win_y = 2
+    if len(canv_windows) > 0:
+        item = canv_windows[-1]
+
+        bbox = canv_1.canv.bbox(item)
+        print(f'    {bbox=}')
+        win_y = bbox[3] + 5
+
+    thiswin = canv_1.canv.create_window(200, win_y, anchor=tk.N, width=400, window=show.view['frame'])
+    canv_windows.append(thiswin)
+
+    show.sched = slides_sched.SlideScheduler(timer,
+                                             lambda n: plot_slide(show, n),
+                                             len(show),
+                                             delay_time,
+                                             skip_late=skip_late_slides,
+                                             on_done=report_timing,
+                                             repeat=repeat)
+    show.sched.set_count(len(show), more_coming=show.view.get('scan') is not None)
+    figure_shows[show.view['fig'].number] = show
+    set_active(show.view['fig'].number)
+    show.sched.play(startnum)
+
+
+def figure_viewport(fig: object) -> dict:
+    """Return the size of a figure in pixels, in the form of viewport."""
+    width, height = fig.get_size_inches() * fig.dpi
+    return {'w': int(width), 'h': int(height)}
+
+
+def report_timing(sched: object) -> None:
+    """Print the timing and cache stats of a show that has finished."""
+    print('show timing: ' + slides_sched.format_stats(sched.stats()))
+    print('slide cache: ' + slides_cache.format_stats(slide_cache.stats()))
+    if disk_cache is not None:
+        print('disk cache: ' + slides_cache.format_disk_stats(disk_cache.stats()))
+    timer_stats = timer.stats()
+    print(f"shared timer: {len(figure_shows)} shows, {timer_stats['calls']} calls "
+          f"in {timer_stats['ticks']} ticks, {timer_stats['deferred']} deferred")
+    if transition_totals:
+        print('transitions: ' + slides_transition.format_stats(transition_totals))
+    if animation_totals:
+        print('animations: ' + slides_anim.format_stats(animation_totals))
+    if budget is not None:
+        print(slides_memory.format_usage(budget.usage(), budget.limit, budget.peak)
+              + f', caches shrunk {budget.evictions} times')
+
+
+def request_slide(show: object, n: int) -> None:
+    """Queue slide n of a show on decode_pool, if it isn't decoded yet.
+
+    The priority is the slide's due time in ms, so the pool works on
+    whichever show needs its next slide soonest.
+    """
+    if n < 0 or n >= len(show) or n in show.slides:
+        return
+
+    priority = int(show.sched.due(n) * 1000)
+    decode_pool.submit((show.view['serial'], n), show.paths[n], show.view['viewport'], priority)
+
+
+def poll_decode() -> None:
+    """Hand slides decoded by decode_pool to their shows.
+
+    Runs on the Tk thread every decode_poll_ms. Slides of shows that have
+    been closed are dropped.
+    """
+    shows = {show.view['serial']: show for show in figure_shows.values()}
+    results = decode_pool.results()
+    for (serial, n), im in results:
+        show = shows.get(serial)
+        if show is None:
+            continue
+        show.slides[n] = im
+        if im is None:
+            show.bad.add(n)
+    if results:
+        enforce_budget()
+
+    root.after(decode_poll_ms, poll_decode)
+
+
+def held_images() -> list:
+    """Return the decoded PIL images held by the shows, their animations and image_source."""
+    images = image_source.images()
+    for show in figure_shows.values():
+        images += [im for im in show.slides.values() if im is not None]
+        if show.view.get('shown_image') is not None:
+            images.append(show.view['shown_image'])
+        if 'animation' in show.view:
+            images += show.view['animation'].images()
+    return images
+
+
+def held_arrays() -> list:
+    """Return the arrays matplotlib keeps for the images in the figures."""
+    arrays = []
+    for show in figure_shows.values():
+        for ax in show.view['fig'].axes:
+            arrays += [a for a in (image.get_array() for image in ax.images) if a is not None]
+    return arrays
+
+
+def enforce_budget() -> None:
+    """Bring the image data held back under memory_mb by shrinking the caches.
+
+    slide_cache gives way first, then image_source. They grow back, up to
+    cache_mb and source_mb, while there is room.
+
+    Uses module variables:
+        budget -- a slides_memory.MemoryBudget, or None
+    """
+    if budget is None:
+        return
+
+    usage = budget.usage()
+    over = budget.over(usage)
+    if over > 0:
+        evictions = budget.evictions
+        for cache in (slide_cache, image_source):
+            if over <= 0:
+                break
+            if cache.nbytes:
+                cache.set_max_bytes(max(0, cache.nbytes - over))
+                budget.evictions += 1
+                over = budget.over(budget.usage())
+        if budget.evictions > evictions:
+            print(slides_memory.format_usage(budget.usage(), budget.limit))
     else:
-        if resume is False:
-            win_y = 2
-            if len(canv_windows) > 0:
-                item = canv_windows[-1]
+        room = -over // 2
+        for cache, limit in ((image_source, source_mb), (slide_cache, cache_mb)):
+            if cache.max_bytes < limit * 2**20:
+                cache.set_max_bytes(min(limit * 2**20, cache.max_bytes + room))
+                break
+
+
+def render_fast(show: object, n: int, text: str) -> bool:
+    """Show slide n in the figure's reused image artist, at the figure's size.
+
+    Returns False, after asking decode_pool for it, if the slide isn't
+    decoded yet. Only slide n and the one after it are kept.
+
+    With transition set, the change from the slide on screen is animated
+    first, and the slide itself is rendered when the transition ends. An
+    animated file's frames follow, while the slide is on screen.
+    """
+    if n not in show.slides:
+        request_slide(show, n)
+        return False
+
+    end_transition(show)
+    end_animation(show)
+    im = show.slides[n]
+    before = show.view.get('shown_image')
+    show.view['shown_image'] = im
+    if transition != 'none' and before is not None and im is not None and before is not im:
+        start_transition(show, before, im, text)
+    else:
+        with trace.span('render', slide=n, file=show.name(n)):
+            slides_mpl.render_image(show.view, im, text, draw_now=trace.enabled)
+    if animate and im is not None and slides_anim.may_be_animated(show.paths[n]):
+        start_animation(show, show.paths[n], im.size, text)
+
+    after = show.following(n)
+    for k in [k for k in show.slides if k != n and k != after]:
+        del show.slides[k]
+    request_slide(show, after)
+
+    return True
+
 
-                bbox = canv_1.canv.bbox(item)
-                print(f'    {bbox=}')
-                win_y = bbox[3] + 5
+def start_transition(show: object, before: Image.Image, after: Image.Image, text: str) -> None:
+    """Animate a show's figure from image before to after, on the shared timer.
 
-            thiswin = canv_1.canv.create_window(200, win_y, anchor=tk.N, width=400, window=fr)
-            canv_windows.append(thiswin)
+    The frames are the size of after, so the figure's scale doesn't jump
+    when after itself is rendered at the end.
+    """
+    view = show.view
+
+    def done():
+        slides_mpl.render_image(view, after, text)
+        slides_transition.add_stats(transition_totals, view.pop('transition').stats())
+
+    view['transition'] = slides_transition.Transition(timer,
+                                                      transition,
+                                                      before,
+                                                      after,
+                                                      after.size,
+                                                      transition_ms / 1000,
+                                                      transition_fps,
+                                                      lambda frame: slides_mpl.render_image(view, frame, text),
+                                                      done)
 
-    images_selected = []
 
-    for n, item in enumerate(image_objects[startnum:], startnum):
-        if run_status is True:
-            plt.clf()
-            # imshow creates the matplotlib Artist "AxesImage" in the container "ax.images"
-            plt.imshow(item)
-            plt.axis("off")
+def end_transition(show: object) -> None:
+    """Stop a show's transition, if one is running, without rendering its last slide."""
+    running = show.view.pop('transition', None)
+    if running is not None:
+        running.on_done = None
+        running.stop()
+        slides_transition.add_stats(transition_totals, running.stats())
 
-            filename = images_opened[n].split('/')[-1]
-            images_selected.append(filename)
 
-            item_text = str(n + 1) + ': ' + filename
-            # figures = plt.get_fignums()
-            # thisname = 'list' + str(figures[-1]) + '_canvas'
+def start_animation(show: object, path: str, size: tuple, text: str) -> None:
+    """Play the frames of a show's slide, if its file is animated, on the shared timer.
+
+    Frames that come while a transition is running are skipped.
+    """
+    view = show.view
+
+    def show_frame(frame):
+        if 'transition' not in view:
+            slides_mpl.render_image(view, frame, text)
 
-            # check for dupe line:
-            # if item_text == t1.get(float(startnum), 'end - 2c'):
-            #     skip insert
-            # END check
+    view['animation'] = slides_anim.Animation(timer,
+                                              path,
+                                              size,
+                                              show_frame,
+                                              resample_quality,
+                                              animation_ahead)
 
-            t1.insert('end', item_text)
-            t1.insert('end', '\n')
 
-            plt.title('image ' + item_text)
-            plt.pause(3)
-        else:
-            break
+def end_animation(show: object) -> None:
+    """Stop a show's animation, if one is playing, and add up its stats."""
+    playing = show.view.pop('animation', None)
+    if playing is not None:
+        playing.stop()
+        if playing.frames:
+            slides_anim.add_stats(animation_totals, playing.stats())
+
+
+def plot_slide(show: object, n: int) -> bool:
+    """Draw slide n of a show in its figure, and highlight it in the file list.
+
+    A file that can't be read is left out of the show (slides_sched.SKIP).
+    """
+    if n in show.bad:
+        return slides_sched.SKIP
+
+    fig = show.view['fig']
+    name = show.name(n)
+    item_text = str(n + 1) + ': ' + name
+
+    if fast_render:
+        if not render_fast(show, n, 'image ' + item_text):
+            return False
+        show.view['list'].select(n)
+        return True
+
+    # a figure-sized copy from this run or an earlier one, else the
+    # full-size image, which image_source keeps (within source_mb)
+    path = show.paths[n]
+    vp = show.view['viewport']
+    full_size = False
+    im = slide_cache.get(path, vp, resample_quality)
+    if im is None and disk_cache is not None:
+        im = disk_cache.get(path, vp, resample_quality)
+        if im is not None:
+            slide_cache.put(path, vp, im, resample_quality)
+    if im is None:
+        im = image_source.load(path)
+        full_size = True
+    if im is None:
+        show.bad.add(n)
+        return slides_sched.SKIP
+
+    show.view['list'].select(n)
+
+    plt.figure(fig.number)
+    with trace.span('clf', slide=n, file=name):
+        plt.clf()
+    # imshow creates the matplotlib Artist "AxesImage" in the container "ax.images"
+    with trace.span('imshow', slide=n, file=name):
+        plt.imshow(im)
+        plt.axis("off")
+
+    # the file shown before (not always slide n - 1, after a seek or when
+    # shuffled) is done with; look at the next one's header
+    shown_path = show.view['shown_path']
+    if shown_path is not None and shown_path != path:
+        image_source.release(shown_path)
+    show.view['shown_path'] = path
+    if show.following(n) < len(show):
+        image_source.open(show.paths[show.following(n)])
+
+    # save a figure-sized copy for the next show of this file
+    if full_size and disk_cache is not None and n not in show.view['saved']:
+        if im.width > vp['w'] or im.height > vp['h']:
+            threading.Thread(target=slides_loader.save_resized,
+                             args=(path, im, vp, disk_cache, resample_quality),
+                             daemon=True).start()
+        show.view['saved'].add(n)
+
+    enforce_budget()
+
+    plt.title('image ' + item_text)
+    if trace.enabled:
+        # draw now rather than when idle, so that drawing is timed
+        with trace.span('draw', slide=n, file=name):
+            fig.canvas.draw()
+    else:
+        fig.canvas.draw_idle()
+
+    return True
 
 
 # Might not need this (as alternative to display_slides when resuming a paused show.)
@@ -226,75 +721,115 @@ def display_slides(fr: object,
 
 
 def set_delay(var: tk.StringVar) -> None:
+    """Set the delay of the active show, and of shows started after it."""
     global delay_time
 
     delay_time = int(var.get())
+    show = active_show()
+    if show is not None:
+        show.sched.set_delay(delay_time)
+
+
+def set_active(num: int) -> None:
+    """Make the show in figure num the one the controls act on.
+
+    Its file list label is highlighted, and the delay entry shows its delay.
+    """
+    global active_figure
+
+    if num not in figure_shows:
+        return
+
+    active_figure = num
+    for fig_num, show in figure_shows.items():
+        show.view['label'].configure(background='cyan' if fig_num == num else 'light gray')
+    delay.set(str(figure_shows[num].sched.delay))
+
+
+def active_show() -> object:
+    """Return the Slideshow of the active show, or else the most recent one."""
+    if active_figure in figure_shows:
+        return figure_shows[active_figure]
+    if figure_shows:
+        return list(figure_shows.values())[-1]
+    return None
+
+
+def seek_show(num: int, n: int) -> None:
+    """Make the show in figure num active and show its slide n."""
+    set_active(num)
+    show = active_show()
+    if show is not None:
+        show.seek(n)
 
 
 def pause_show(ev):
-    """uses module objects:
+    """Pause the active show.
 
-    images_opened, image_objects
+    uses module objects:
+    figure_shows
     """
     print(f'in pause_show')
-    global run_status
-
-    run_status = False
+    show = active_show()
+    if show is not None:
+        show.sched.pause()
 
 
 def resume_show(ev) -> None:
-    global images_opened
-    global images_selected
-    global run_status
-
-    run_status = True
     print(f'in resume_show')
+    show = active_show()
+    if show is not None:
+        show.sched.resume()
 
-    thisnum = 0
 
-    # get the most recent Frame
-    # children = root.winfo_children()
-    # frames = [i for i in children if i.__class__ == ttk.Frame]
-    thisnum = len(images_selected)
-    print(f'    {len(images_opened)=}')
-    print(f'    {len(images_selected)=}')
-    # cfr = frames[0].winfo_children()[-1]
-    cfr = list_frames[-1]
+def restart_slides(canv: object) -> None:
+    print(f'in restart_slides...')
+    show = active_show()
+    if show is None:
+        return
 
-    # print('resume_show:')
-    # print(f'    {frames[0]=}, {type(frames[0])=}')
-    # print(f'    {cfr=}, {type(cfr)=}')
-    display_slides(cfr, thisnum, resume=True)
+    show.sched.restart()
 
 
-def restart_slides(canv: object) -> None:
-    # global images_opened
-    # global images_selected
-    global run_status
+def step_forward(ev=None):
+    """Display the next image in the active show."""
+    show = active_show()
+    if show is not None:
+        show.next()
 
-    print(f'in restart_slides...')
-    children = canv_1.winfo_children()
-    frames = [i for i in children if i.__class__ == tk.Frame]
-    fr = frames[-1]
 
-    run_status = True
-    thisnum = 0
+def step_back(ev=None):
+    """Display the previous image in the active show."""
+    show = active_show()
+    if show is not None:
+        show.prev()
 
-    display_slides(fr, thisnum, restart=True)
 
+def step_first(ev=None):
+    show = active_show()
+    if show is not None:
+        show.first()
 
-def step_forward(ev):
-    """Display the next image in the current show list"""
-    print(f'in step_forward, {ev=}')
-    if run_status == False:
-        pass
 
+def step_last(ev=None):
+    show = active_show()
+    if show is not None:
+        show.last()
 
-def step_back(ev):
-    """Display the previous image in current show list."""
-    print(f'in step_back, {ev=}')
-    if run_status == False:
-        pass
+
+def jump_to_slide(ev=None):
+    """Ask for a slide number and display that slide of the active show."""
+    show = active_show()
+    if show is None:
+        return
+
+    number = simpledialog.askinteger('Go to slide',
+                                     f'Slide number (1 - {len(show)}):',
+                                     parent=root,
+                                     minvalue=1,
+                                     maxvalue=len(show))
+    if number is not None:
+        show.jump(number)
 
 
 def get_list_display(ev):
@@ -303,14 +838,30 @@ def get_list_display(ev):
 
 
 def on_close(ev):
-    # print(f'in on_close, {ev=}')
+    """Stop the show whose figure was closed."""
     # _number is used in the default window title, and as a unique number for
     # the matplotlib figure object.
-    # Although we could access this protected attribute to determine the figure
-    # that was closed, we still need to keep track of the figure number as a
-    # global var so that the corresponding canvas_window can be deleted.
-    # print(f'    {ev.canvas.figure._number=}')
-    pass
+    show = figure_shows.pop(ev.canvas.figure.number, None)
+    if show is not None:
+        show.sched.stop()
+        end_transition(show)
+        end_animation(show)
+        if show.view['scan'] is not None:
+            show.view['scan'].stop()
+        # release image_source's files, apart from those the other shows
+        # are on or about to show
+        keep = set()
+        for other in figure_shows.values():
+            n = other.sched.current
+            if n is not None and n < len(other):
+                keep.add(other.paths[n])
+                if other.following(n) < len(other):
+                    keep.add(other.paths[other.following(n)])
+        for path in image_source.paths():
+            if path not in keep:
+                image_source.release(path)
+        if figure_shows:
+            set_active(list(figure_shows)[-1])
 
 
 def set_enter_canvas(ev):
@@ -332,15 +883,34 @@ style2 = sttk.create_styles()
 
 viewport = {'w': 400, 'h': 300, 'gutter': 10}
 my_pady = 10
-run_status=True
-
-# ? are all 3 of these lists necessary
-images_selected = []
-images_opened = []
-image_objects = []
 
 canv_windows = []
 list_frames = []
+figure_shows = {}
+active_figure = None
+catalog = None
+show_serials = itertools.count()
+transition_totals = {}
+animation_totals = {}
+timer = slides_sched.SharedTimer(root)
+slide_cache = slides_cache.SlideCache(cache_mb * 2**20)
+image_source = slides_loader.ImageSource(max_open_files, source_mb * 2**20)
+disk_cache = None
+if disk_cache_dir is not None:
+    disk_cache = slides_cache.DiskCache(disk_cache_dir, disk_cache_mb * 2**20)
+decode_pool = slides_loader.Prefetcher(decode_workers,
+                                       decode_queue,
+                                       slide_cache,
+                                       disk_cache,
+                                       resample_quality)
+budget = None
+if memory_mb is not None:
+    budget = slides_memory.MemoryBudget(memory_mb * 2**20)
+    budget.track('decoded', held_images)
+    budget.track('figures', held_arrays, slides_memory.array_bytes)
+    budget.track('cache', slide_cache.images)
+root.after(decode_poll_ms, poll_decode)
+root.after(scan_poll_ms, poll_scans)
 
 
 canv_1 = sel.CanvasFrame(root,
@@ -372,6 +942,14 @@ root.bind_all('<Control-Down>',
 root.bind_all('<Control-Up>',
                    lambda ev: resume_show(ev)
                    )
+root.bind_all('<Control-Right>', step_forward)
+root.bind_all('<Control-Left>', step_back)
+root.bind_all('<Control-Home>', step_first)
+root.bind_all('<Control-End>', step_last)
+root.bind_all('<Control-g>', jump_to_slide)
+root.bind_all('<Control-s>', save_show)
+root.bind_all('<Control-i>', index_folder)
+root.bind_all('<Control-f>', find_slides)
 
 textvar = tk.StringVar()
 caption = ttk.Entry(root, justify='center', textvariable=textvar)
@@ -381,6 +959,9 @@ caption.update()
 open_button = ttk.Button(root, text="Open Files", command=lambda c=canv_1: select_image_files(c))
 open_button.pack(pady=my_pady)
 
+folder_button = ttk.Button(root, text="Open Folder", command=lambda c=canv_1: select_folder(c))
+folder_button.pack(pady=my_pady)
+
 ui_fr = ttk.Frame(root, relief='groove', style='alt.TFrame')
 
 delay = tk.StringVar(value='3')
@@ -414,7 +995,7 @@ btnq = ttk.Button(root,
 btnq.pack(side="top", pady=my_pady)
 btnq.update()
 
-total_ht = canv_1.winfo_height() + caption.winfo_height() + open_button.winfo_height() + ui_fr.winfo_height() + btnq.winfo_height()
+total_ht = canv_1.winfo_height() + caption.winfo_height() + open_button.winfo_height() + folder_button.winfo_height() + ui_fr.winfo_height() + btnq.winfo_height()
 total_wd = max(canv_1.winfo_width(), ui_fr.winfo_width())
 
 # begin test: show some layout dimensions ----------
@@ -0,0 +1,397 @@
+"""
+program: slides_sched.py
+
+purpose: For project slideshow.
+
+comments: Runs a slideshow from Tk after() timers, so the event loop is
+          never blocked between slides: pause, resume, the delay entry and
+          window resizes are handled as soon as they happen.
+
+history:
+-------
+10-18-2026  SlideScheduler replaces the time.sleep / plt.pause loops.
+10-18-2026  Schedule slides against absolute deadlines; add timing stats.
+10-18-2026  Add seek().
+10-18-2026  SharedTimer: one Tk timer for the schedulers of several shows.
+10-18-2026  Add set_count() and more_coming, for playlists that grow while
+            the show plays.
+10-18-2026  Add repeat: 'all' loops the show, 'one' holds one slide.
+10-18-2026  Add upcoming and renumber(), for slides added to or removed
+            from a running show.
+10-18-2026  show_slide can return SKIP to leave out a slide that can't be
+            shown, such as a file that couldn't be read.
+"""
+import array
+import heapq
+import itertools
+import math
+import time
+
+# returned by show_slide for a slide that is to be left out of the show
+SKIP = 'skip'
+
+
+class SlideScheduler:
+    """Play slides 0..count-1 with a hold of delay seconds on each.
+
+    show_slide(n) is called to put slide n on screen. It returns True when
+    the slide is showing, or False if the slide isn't ready yet (still
+    being decoded, for instance); then it is called again retry_ms later.
+    It returns SKIP for a slide that can't be shown at all: the slide is
+    left out, and the one after it takes its place in the schedule.
+
+    Slide n is due at start + (n - first) * delay on the monotonic clock,
+    so time spent getting a slide ready comes out of its hold instead of
+    pushing back the rest of the show. With skip_late, a slide that is
+    still not showing when the next one is due is dropped. Pausing, or
+    changing the delay, starts the count again from the next slide.
+
+    repeat is 'off', 'all' (after the last slide, carry on from the first,
+    on the same schedule) or 'one' (show the current slide again every
+    delay seconds until seek or pause).
+
+    on_done(scheduler) is called when the last slide's hold ends. While
+    more_coming is set (see set_count), a show that reaches the last slide
+    waits for more instead of ending.
+
+    status is one of:
+        'idle'    -- created, not started
+        'playing'
+        'paused'  -- resume() shows the next slide right away; seek() while
+                     not playing also leaves the show paused
+        'done'    -- the last slide has had its hold time
+        'stopped' -- stop() was called, e.g. because the window was closed
+    """
+    def __init__(self,
+                 widget: object,
+                 show_slide,
+                 count: int,
+                 delay: float,
+                 retry_ms: int=10,
+                 skip_late: bool=False,
+                 late_tolerance: float=0.05,
+                 on_done=None,
+                 repeat: str='off'
+                 ):
+        self.widget = widget
+        self.show_slide = show_slide
+        self.count = count
+        self.delay = delay
+        self.retry_ms = retry_ms
+        self.skip_late = skip_late
+        self.late_tolerance = late_tolerance
+        self.on_done = on_done
+        self.repeat = repeat
+        self.more_coming = False
+
+        self.status = 'idle'
+        self.current = None
+        self._next = 0
+        self._timer = None
+        self._first = 0
+        self._t0 = 0.0
+        self._reset_stats()
+
+    def play(self, start: int=0) -> None:
+        """Start the show at slide start."""
+        self._cancel()
+        self._reset_stats()
+        self.status = 'playing'
+        self._next = start
+        self._anchor(start, time.monotonic())
+        self._step()
+
+    def pause(self) -> None:
+        if self.status == 'playing':
+            self._cancel()
+            self.status = 'paused'
+
+    def resume(self) -> None:
+        if self.status == 'paused':
+            self.status = 'playing'
+            self._anchor(self._next, time.monotonic())
+            self._step()
+
+    def restart(self) -> None:
+        self.play(0)
+
+    def seek(self, n: int) -> None:
+        """Show slide n now; n is clamped to the playlist.
+
+        A playing show carries on from slide n with a full hold. Otherwise
+        the show is left paused on slide n.
+        """
+        if self.count == 0 or self.status == 'stopped':
+            return
+
+        self._cancel()
+        self._next = max(0, min(n, self.count - 1))
+        if self.status == 'playing':
+            self._anchor(self._next, time.monotonic())
+            self._step()
+        else:
+            self.status = 'paused'
+            self._show_paused()
+
+    def stop(self) -> None:
+        self._cancel()
+        self.status = 'stopped'
+
+    def set_delay(self, delay: float) -> None:
+        """Change the hold time, starting with the slide on screen."""
+        if self.status == 'playing' and self.current is not None and self._timer is not None:
+            shown_at = self.due(self.current)
+            self.delay = delay
+            self._anchor(self.current, shown_at)
+            self._cancel()
+            self._schedule()
+        else:
+            self.delay = delay
+
+    def set_count(self, count: int, more_coming: bool=False) -> None:
+        """Change the number of slides, e.g. as a folder scan finds files."""
+        self.count = count
+        self.more_coming = more_coming
+
+    @property
+    def upcoming(self) -> int:
+        """Index of the slide to be shown next."""
+        return self._next
+
+    def renumber(self, current: int | None, upcoming: int, count: int) -> None:
+        """Follow slides being added or removed before or after the current one.
+
+        current and upcoming are the new indexes of the slide on screen and
+        the next one, and count the new number of slides. The next slide is
+        still due at the same time.
+        """
+        due_next = self.due(self._next)
+        self.current = current
+        self._next = upcoming
+        self.count = count
+        self._anchor(upcoming, due_next)
+
+    def due(self, n: int) -> float:
+        """Return the monotonic time at which slide n should be shown."""
+        return self._t0 + (n - self._first) * self.delay
+
+    def stats(self) -> dict:
+        """Return timing figures for the show so far, in seconds.
+
+        lateness is how long after its deadline a slide went on screen.
+        'late' counts slides later than late_tolerance, 'skipped' the
+        slides left out by show_slide, and 'end_error' is
+        how far the end of the show was from its deadline (None until the
+        show is done).
+        """
+        late = sorted(self._lateness)
+        num = len(late)
+        if num:
+            mean = sum(late) / num
+            p95 = late[min(num - 1, math.ceil(0.95 * num) - 1)]
+            worst = late[-1]
+        else:
+            mean = p95 = worst = 0.0
+
+        return {'shown': num,
+                'late': sum(1 for x in late if x > self.late_tolerance),
+                'dropped': self.dropped,
+                'skipped': self.skipped,
+                'mean_lateness': mean,
+                'p95_lateness': p95,
+                'worst_overrun': worst,
+                'end_error': self.end_error}
+
+    def _reset_stats(self) -> None:
+        self._lateness = array.array('d')
+        self.dropped = 0
+        self.skipped = 0
+        self._skipped_in_row = 0
+        self.end_error = None
+
+    def _anchor(self, n: int, t: float) -> None:
+        self._first = n
+        self._t0 = t
+
+    def _cancel(self) -> None:
+        if self._timer is not None:
+            self.widget.after_cancel(self._timer)
+            self._timer = None
+
+    def _schedule(self) -> None:
+        wait = self.due(self._next) - time.monotonic()
+        self._timer = self.widget.after(max(0, math.ceil(wait * 1000)), self._step)
+
+    def _show_paused(self) -> None:
+        self._timer = None
+        if self.status != 'paused':
+            return
+
+        shown = self.show_slide(self._next)
+        if shown is SKIP:
+            if self._next + 1 < self.count:
+                self._skip(self._show_paused)
+            return
+        if not shown:
+            self._timer = self.widget.after(self.retry_ms, self._show_paused)
+            return
+
+        self.current = self._next
+        self._next += 1
+
+    def _skip(self, step) -> None:
+        """Leave out slide _next; the slide after it is due in its place."""
+        self.skipped += 1
+        self._skipped_in_row += 1
+        self._anchor(self._next + 1, self.due(self._next))
+        self._next += 1
+        self._timer = self.widget.after(0, step)
+
+    def _step(self) -> None:
+        self._timer = None
+        if self.status != 'playing':
+            return
+
+        now = time.monotonic()
+        if self._next >= self.count and self.more_coming:
+            self._timer = self.widget.after(self.retry_ms, self._step)
+            return
+
+        if self._next >= self.count and self.repeat == 'all' and self.count:
+            self._anchor(0, self.due(self.count))
+            self._next = 0
+
+        if self._next >= self.count or self._skipped_in_row >= self.count:
+            self.status = 'done'
+            self.end_error = now - self.due(self.count)
+            if self.on_done is not None:
+                self.on_done(self)
+            return
+
+        if self.skip_late and self.repeat != 'one':
+            while self._next + 1 < self.count and now >= self.due(self._next + 1):
+                self._next += 1
+                self.dropped += 1
+
+        shown = self.show_slide(self._next)
+        if shown is SKIP:
+            self._skip(self._step)
+            return
+        if not shown:
+            self._timer = self.widget.after(self.retry_ms, self._step)
+            return
+
+        self._skipped_in_row = 0
+        self._lateness.append(max(0.0, time.monotonic() - self.due(self._next)))
+        self.current = self._next
+        if self.repeat == 'one':
+            self._anchor(self._next, self.due(self._next) + self.delay)
+        else:
+            self._next += 1
+        self._schedule()
+
+
+class SharedTimer:
+    """One Tk after() timer for any number of SlideSchedulers.
+
+    Pass it to SlideScheduler in place of the widget: it has the same
+    after() and after_cancel() calls. Callbacks wait in a heap by due time
+    and the Tk timer is only ever set for the earliest one, so a dozen
+    shows cost one timer instead of a dozen.
+
+    When several callbacks are due they run earliest deadline first, so a
+    show that has waited longest goes next and a show waiting on a slow
+    slide (which retries after retry_ms) can't hold up the others. A tick
+    stops after budget_ms and leaves the rest to the next one, letting Tk
+    handle input and redraws in between.
+    """
+    def __init__(self, widget: object, budget_ms: int=30):
+        self.widget = widget
+        self.budget_ms = budget_ms
+        self.ticks = 0
+        self.calls = 0
+        self.deferred = 0
+        # heap entries: (due, id); cancelled ids are dropped from _calls
+        self._heap = []
+        self._calls = {}
+        self._ids = itertools.count()
+        self._timer = None
+        self._timer_due = None
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def after(self, ms: int, func, *args) -> int:
+        """Call func(*args) in ms milliseconds; return an id for after_cancel."""
+        call_id = next(self._ids)
+        heapq.heappush(self._heap, (time.monotonic() + ms / 1000, call_id))
+        self._calls[call_id] = (func, args)
+        self._arm()
+        return call_id
+
+    def after_cancel(self, call_id: int) -> None:
+        self._calls.pop(call_id, None)
+
+    def stats(self) -> dict:
+        return {'waiting': len(self._calls),
+                'ticks': self.ticks,
+                'calls': self.calls,
+                'deferred': self.deferred}
+
+    def _arm(self) -> None:
+        """Set the Tk timer for the earliest callback, if it isn't set already."""
+        while self._heap and self._heap[0][1] not in self._calls:
+            heapq.heappop(self._heap)
+
+        if not self._heap:
+            if self._timer is not None:
+                self.widget.after_cancel(self._timer)
+                self._timer = None
+            return
+
+        due = self._heap[0][0]
+        if self._timer is not None:
+            if self._timer_due <= due:
+                return
+            self.widget.after_cancel(self._timer)
+
+        wait = due - time.monotonic()
+        self._timer_due = due
+        self._timer = self.widget.after(max(0, math.ceil(wait * 1000)), self._tick)
+
+    def _tick(self) -> None:
+        self._timer = None
+        self.ticks += 1
+        start = time.monotonic()
+        while self._heap:
+            due, call_id = self._heap[0]
+            if call_id not in self._calls:
+                heapq.heappop(self._heap)
+                continue
+
+            now = time.monotonic()
+            if due > now:
+                break
+            if now - start > self.budget_ms / 1000:
+                self.deferred += 1
+                break
+
+            heapq.heappop(self._heap)
+            func, args = self._calls.pop(call_id)
+            self.calls += 1
+            func(*args)
+
+        self._arm()
+
+
+def format_stats(stats: dict) -> str:
+    """Return a one-line summary of SlideScheduler.stats()."""
+    text = (f"{stats['shown']} shown, {stats['late']} late, {stats['dropped']} dropped, "
+            f"{stats['skipped']} skipped; "
+            f"lateness mean {stats['mean_lateness'] * 1000:.1f} ms, "
+            f"p95 {stats['p95_lateness'] * 1000:.1f} ms, "
+            f"worst {stats['worst_overrun'] * 1000:.1f} ms")
+    if stats['end_error'] is not None:
+        text += f"; ended {stats['end_error'] * 1000:+.1f} ms from schedule"
+
+    return text
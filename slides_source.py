@@ -0,0 +1,134 @@
+"""
+program: slides_source.py
+
+purpose: For project slideshow.
+
+comments: Playlists from a folder instead of a file dialog selection. The
+          folder is scanned with os.scandir on a background thread, so a
+          show can start on the first image found while the scan goes on
+          adding the rest.
+
+history:
+-------
+10-18-2026  scan_folder and FolderScan.
+"""
+import fnmatch
+import os
+import queue
+import re
+import threading
+import time
+
+# file name patterns for a folder scan; matched without regard to case
+IMAGE_PATTERNS = ('*.png', '*.jpg', '*.jpeg', '*.gif', '*.bmp', '*.tif', '*.tiff', '*.webp')
+
+
+def compile_patterns(patterns) -> object:
+    """Return one case-insensitive regex matching any of the glob patterns."""
+    return re.compile('|'.join(fnmatch.translate(p) for p in patterns), re.IGNORECASE)
+
+
+def scan_folder(folder: str,
+                recursive: bool=False,
+                patterns=IMAGE_PATTERNS,
+                stop: threading.Event | None=None
+                ):
+    """Yield the paths of files in folder whose names match patterns.
+
+    Files are yielded in the order os.scandir returns them, as they are
+    found. With recursive, subfolders are scanned after the files of their
+    parent, in name order; symlinks to folders are not followed. Folders
+    that can't be read are skipped. Setting stop ends the scan.
+    """
+    match = compile_patterns(patterns).match
+    folders = [folder]
+    while folders:
+        top = folders.pop()
+        try:
+            it = os.scandir(top)
+        except OSError as e:
+            print(f'error reading folder: {str(e)}')
+            continue
+
+        subfolders = []
+        with it:
+            for entry in it:
+                if stop is not None and stop.is_set():
+                    return
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            subfolders.append(entry.path)
+                    elif match(entry.name) and entry.is_file():
+                        yield entry.path
+                except OSError:
+                    continue
+
+        # pop() takes from the end, so push in reverse to visit in name order
+        folders += sorted(subfolders, reverse=True)
+
+
+class FolderScan:
+    """Run scan_folder on a thread, and hand out the paths it finds.
+
+    take() returns the paths found since the last call; call it from the
+    Tk thread (from root.after, for instance). The first path is handed
+    over as soon as it is found, then they come in batches of up to batch
+    paths, or whatever was found in the last flush_s seconds.
+
+    finished is True once the scan has ended and take() has returned
+    every path.
+    """
+    def __init__(self,
+                 folder: str,
+                 recursive: bool=False,
+                 patterns=IMAGE_PATTERNS,
+                 batch: int=512,
+                 flush_s: float=0.1
+                 ):
+        self.folder = folder
+        self.found = 0
+        self.finished = False
+        self._batch = batch
+        self._flush_s = flush_s
+        self._done = False
+        self._paths = queue.SimpleQueue()
+        self._stop = threading.Event()
+
+        threading.Thread(target=self._run,
+                         args=(folder, recursive, patterns),
+                         name='folder-scan',
+                         daemon=True).start()
+
+    def take(self) -> list:
+        done = self._done
+        paths = []
+        while True:
+            try:
+                paths += self._paths.get_nowait()
+            except queue.Empty:
+                break
+
+        if done:
+            self.finished = True
+        return paths
+
+    def stop(self) -> None:
+        """End the scan, e.g. because the show was closed."""
+        self._stop.set()
+
+    def _run(self, folder: str, recursive: bool, patterns) -> None:
+        batch = []
+        flushed = time.monotonic()
+        for path in scan_folder(folder, recursive, patterns, self._stop):
+            batch.append(path)
+            self.found += 1
+            now = time.monotonic()
+            if self.found == 1 or len(batch) >= self._batch or now - flushed >= self._flush_s:
+                self._paths.put(batch)
+                batch = []
+                flushed = now
+
+        if batch:
+            self._paths.put(batch)
+        self._done = True
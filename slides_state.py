@@ -0,0 +1,225 @@
+"""
+program: slides_state.py
+
+purpose: For project slideshow.
+
+comments: The state of one slideshow: its playlist, the slides decoded so
+          far, and the position and play status from its scheduler.
+          Replaces the images_opened / images_selected / image_objects
+          globals in the applications.
+
+history:
+-------
+10-18-2026  Slideshow, with next/prev/first/last/jump seeking.
+10-18-2026  Add extend(), for playlists that grow while the show plays.
+10-18-2026  paths is a slides_playlist.Playlist, which can be shuffled.
+10-18-2026  A Playlist passed in (e.g. a loaded one) is used as it is.
+10-18-2026  Add insert() and remove(), which keep the position and the
+            decoded slides of a running show.
+10-18-2026  Add sources.
+10-18-2026  Shuffled playlists keep their order as they grow; insert() into one
+            adds at the end and keeps the decoded slides.
+10-18-2026  next() and prev() after the slide on screen is removed go on from the
+            slide due next.
+10-18-2026  Removing from a shuffled show clears the current slide.
+"""
+import bisect
+
+import slides_playlist
+
+
+class Slideshow:
+    """One show's playlist, decoded slides and position.
+
+    paths is a slides_playlist.Playlist: paths[n] is the file of slide n,
+    in shuffled order if shuffle is set. A Playlist passed in as paths is
+    used as it is, with its own shuffle setting.
+
+    slides holds the decoded slides that are in memory, by playlist index,
+    in whatever form the application displays them (a PhotoImage for
+    slides_canvas, a PIL Image for slides_plot). bad holds the indexes of
+    files that couldn't be read. sources holds, where the application
+    keeps them, the PIL images the slides were made from.
+
+    sched is the SlideScheduler running the show; index and status come
+    from it, so there is one place that knows which slide is showing.
+    view is for the application: the widgets the show is displayed in.
+    """
+    def __init__(self, paths, shuffle: bool=False, seed: int | None=None):
+        if isinstance(paths, slides_playlist.Playlist):
+            self.paths = paths
+        else:
+            self.paths = slides_playlist.Playlist(paths, shuffle, seed)
+        self.slides = {}
+        self.sources = {}
+        self.bad = set()
+        self.window = []
+        self.sched = None
+        self.view = {}
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    @property
+    def index(self) -> int | None:
+        """Index of the slide on screen, or None before the first one."""
+        if self.sched is None:
+            return None
+        return self.sched.current
+
+    @property
+    def status(self) -> str:
+        if self.sched is None:
+            return 'idle'
+        return self.sched.status
+
+    def following(self, n: int) -> int:
+        """Return the slide that plays after slide n, allowing for repeat.
+
+        The result is len(self) after the last slide of a show that
+        doesn't loop.
+        """
+        repeat = 'off' if self.sched is None else self.sched.repeat
+        if repeat == 'one':
+            return n
+        if repeat == 'all' and len(self.paths):
+            return (n + 1) % len(self.paths)
+        return n + 1
+
+    def insert(self, i: int, paths):
+        """Put paths in the playlist before slide i (at the end if i is len(self)).
+
+        The slide on screen, the one due next and the decoded slides keep
+        their place; only their indexes change. Slides put right after the
+        one on screen play next.
+
+        Returns moved, a function that gives the new index of an old slide
+        index, for the application's own per-slide state. A shuffled
+        playlist can only grow at the end (see extend): paths are shuffled
+        among themselves after the slides already there, whatever i is, and
+        no slide moves.
+        """
+        paths = list(paths)
+        num = len(paths)
+        if self.paths.shuffled:
+            self.extend(paths, self.sched is not None and self.sched.more_coming)
+            return lambda k: k
+
+        for path in reversed(paths):
+            self.paths.insert(i, path)
+
+        def moved(k):
+            return k + num if k >= i else k
+
+        self._renumber(moved)
+        if self.sched is not None:
+            upcoming = self.sched.upcoming
+            self.sched.renumber(None if self.index is None else moved(self.index),
+                                upcoming + num if upcoming > i else upcoming,
+                                len(self.paths))
+        return moved
+
+    def remove(self, indexes):
+        """Take slides out of the playlist.
+
+        The slides that stay keep their decoded images; if the slide on
+        screen is removed, the show goes on with the slide after it. Returns
+        moved, as insert() does, which gives None for a removed slide. In a
+        shuffled playlist, removing reshuffles every slide: the decoded
+        slides are dropped, and moved returns None for every slide.
+        """
+        gone = sorted(set(n for n in indexes if 0 <= n < len(self.paths)))
+        if not gone:
+            return lambda k: k
+        gone_set = set(gone)
+        old_count = len(self.paths)
+
+        for k in sorted((self.paths.entry(n) for n in gone), reverse=True):
+            self.paths.pop(k)
+        if self.paths.shuffled:
+            return self._reordered()
+
+        def moved(k):
+            if k in gone_set:
+                return None
+            return k - bisect.bisect_left(gone, k)
+
+        self._renumber(moved)
+        if self.sched is not None:
+            upcoming = self.sched.upcoming
+            while upcoming in gone_set:
+                upcoming += 1
+            upcoming = moved(upcoming) if upcoming < old_count else len(self.paths)
+            current = None if self.index is None else moved(self.index)
+            self.sched.renumber(current, upcoming, len(self.paths))
+        return moved
+
+    def _renumber(self, moved) -> None:
+        """Move the per-slide state to the new slide indexes."""
+        self.slides = {moved(k): v for k, v in self.slides.items() if moved(k) is not None}
+        self.sources = {moved(k): v for k, v in self.sources.items() if moved(k) is not None}
+        self.bad = {moved(k) for k in self.bad if moved(k) is not None}
+        self.window = [moved(k) for k in self.window if moved(k) is not None]
+
+    def _reordered(self):
+        """Drop the per-slide state after a shuffled playlist has changed.
+
+        Every index now holds another file, the one on screen included, so
+        the show has no current slide until the next one is shown.
+        """
+        self.slides = {}
+        self.sources = {}
+        self.bad = set()
+        self.window = []
+        if self.sched is not None:
+            self.sched.renumber(None, min(self.sched.upcoming, len(self.paths)), len(self.paths))
+        return lambda k: None
+
+    def name(self, n: int) -> str:
+        """Return the file name of slide n."""
+        return self.paths.name(n)
+
+    def caption(self, n: int) -> str:
+        return str(n + 1) + ' of ' + str(len(self.paths)) + ': ' + self.name(n)
+
+    def extend(self, paths, more_coming: bool=False) -> None:
+        """Add paths to the end of the playlist.
+
+        more_coming says whether more will follow; until it's False, a
+        show that reaches the end waits for them. Every slide keeps its
+        index and file, shuffled or not, so the decoded slides stay valid;
+        in a shuffled playlist the new paths play, shuffled, after the
+        slides already there.
+        """
+        self.paths.extend(paths)
+        if self.sched is not None:
+            self.sched.set_count(len(self.paths), more_coming)
+
+    def seek(self, n: int) -> None:
+        """Show slide n now (see SlideScheduler.seek)."""
+        if self.sched is not None:
+            self.sched.seek(n)
+
+    def next(self) -> None:
+        """Show the slide after the one on screen, or if it was removed, the one due next."""
+        if self.index is not None:
+            self.seek(self.index + 1)
+        elif self.sched is not None:
+            self.seek(self.sched.upcoming)
+
+    def prev(self) -> None:
+        """Show the slide before the one on screen, or before the one due next."""
+        if self.index is not None:
+            self.seek(self.index - 1)
+        elif self.sched is not None:
+            self.seek(self.sched.upcoming - 1)
+
+    def first(self) -> None:
+        self.seek(0)
+
+    def last(self) -> None:
+        self.seek(len(self.paths) - 1)
+
+    def jump(self, number: int) -> None:
+        """Show slide number, counting from 1 as in the captions."""
+        self.seek(number - 1)
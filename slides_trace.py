@@ -0,0 +1,131 @@
+"""
+program: slides_trace.py
+
+purpose: For project slideshow.
+
+comments: Opt-in timing of the steps each slide goes through (open,
+          decode, resize, PhotoImage, display...). Spans are recorded in
+          memory and, when the program exits, written as a Chrome trace
+          (load it in chrome://tracing or ui.perfetto.dev) and summarized
+          per step on stdout.
+
+          Turn it on by naming the trace file in the environment:
+              SLIDES_TRACE=trace.json python slides_canvas.py
+          or by calling enable(). When it's off, span() returns a shared
+          do-nothing context manager, so the cost is one function call.
+
+history:
+-------
+10-18-2026  Spans, Chrome trace export and per-step summary.
+"""
+import atexit
+import json
+import math
+import os
+import threading
+import time
+
+enabled = False
+trace_file = None
+
+# (name, start ns, duration ns, thread id, args)
+_events = []
+_thread_names = {}
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_null_span = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('name', 'args', 'start')
+
+    def __init__(self, name: str, args: dict):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        tid = threading.get_ident()
+        if tid not in _thread_names:
+            _thread_names[tid] = threading.current_thread().name
+        _events.append((self.name, self.start, end - self.start, tid, self.args))
+        return False
+
+
+def span(name: str, **args) -> object:
+    """Return a context manager that records how long its block takes.
+
+    args (e.g. slide=n, file=name) are saved with the span.
+    """
+    if not enabled:
+        return _null_span
+    return _Span(name, args)
+
+
+def enable(path: str='trace.json') -> None:
+    """Start recording spans; write them to path when the program exits."""
+    global enabled
+    global trace_file
+
+    if not enabled:
+        atexit.register(finish)
+    enabled = True
+    trace_file = path
+
+
+def export(path: str) -> None:
+    """Write the recorded spans to path in Chrome trace event format."""
+    pid = os.getpid()
+    events = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+               'args': {'name': name}}
+              for tid, name in list(_thread_names.items())]
+    for name, start, dur, tid, args in list(_events):
+        events.append({'name': name, 'cat': 'slides', 'ph': 'X',
+                       'ts': start / 1000, 'dur': dur / 1000,
+                       'pid': pid, 'tid': tid, 'args': args})
+
+    with open(path, 'w') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
+def summary() -> str:
+    """Return a table of count, total, mean, p95 and max time per step, in ms."""
+    by_name = {}
+    for name, start, dur, tid, args in list(_events):
+        by_name.setdefault(name, []).append(dur / 1e6)
+
+    lines = [f"{'step':<18}{'count':>7}{'total':>11}{'mean':>9}{'p95':>9}{'max':>9}"]
+    for name, durs in sorted(by_name.items(), key=lambda item: -sum(item[1])):
+        durs.sort()
+        num = len(durs)
+        p95 = durs[min(num - 1, math.ceil(0.95 * num) - 1)]
+        lines.append(f'{name:<18}{num:>7}{sum(durs):>11.1f}{sum(durs) / num:>9.2f}'
+                     f'{p95:>9.2f}{durs[-1]:>9.2f}')
+
+    return '\n'.join(lines)
+
+
+def finish() -> None:
+    """Write the trace file and print the summary, if anything was recorded."""
+    if not _events:
+        return
+
+    export(trace_file)
+    print(f'trace written to {trace_file}')
+    print(summary())
+
+
+if os.environ.get('SLIDES_TRACE'):
+    enable(os.environ['SLIDES_TRACE'])
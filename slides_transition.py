@@ -0,0 +1,196 @@
+"""
+program: slides_transition.py
+
+purpose: For project slideshow.
+
+comments: Crossfade, slide and wipe transitions between two slides. The
+          in-between frames are made on a worker thread with PIL (blend,
+          crop and paste work on whole buffers in C) and shown from Tk
+          timers at a target frame rate. A frame that isn't ready when
+          the next one is due is dropped, so a slow machine gets a jerkier
+          transition but the show stays on time.
+
+history:
+-------
+10-18-2026  Transition, compose and the frame functions.
+"""
+import math
+import queue
+import threading
+import time
+
+from PIL import Image
+
+KINDS = ('crossfade', 'slide', 'wipe')
+
+
+def compose(im: Image.Image, size: tuple, background: tuple) -> Image.Image:
+    """Return im centered on an RGB image of size, filled with background."""
+    frame = Image.new('RGB', size, background)
+    if im.mode not in ('RGB', 'RGBA'):
+        im = im.convert('RGB')
+    offset = ((size[0] - im.width) // 2, (size[1] - im.height) // 2)
+    frame.paste(im, offset, im if im.mode == 'RGBA' else None)
+    return frame
+
+
+def crossfade(a: Image.Image, b: Image.Image, t: float) -> Image.Image:
+    return Image.blend(a, b, t)
+
+
+def slide(a: Image.Image, b: Image.Image, t: float) -> Image.Image:
+    """b pushes a out to the left."""
+    width, height = a.size
+    x = round(width * t)
+    frame = Image.new('RGB', a.size)
+    frame.paste(a.crop((x, 0, width, height)), (0, 0))
+    frame.paste(b.crop((0, 0, x, height)), (width - x, 0))
+    return frame
+
+
+def wipe(a: Image.Image, b: Image.Image, t: float) -> Image.Image:
+    """b is uncovered from left to right."""
+    x = round(a.width * t)
+    frame = a.copy()
+    frame.paste(b.crop((0, 0, x, a.height)), (0, 0))
+    return frame
+
+
+FRAMES = {'crossfade': crossfade, 'slide': slide, 'wipe': wipe}
+
+
+class Transition:
+    """Play a transition from image a to image b.
+
+    a and b are composed onto size-sized frames of background colour, and
+    the frames in between are made on a thread, a few ahead of the one on
+    screen; frames whose time has already passed are not made at all.
+    widget's after() (a Tk widget or a slides_sched.SharedTimer) calls a
+    tick every frame interval, which passes the latest frame that is due to
+    show_frame(image) and counts the ones it skipped as dropped.
+
+    on_done() is called after the last frame's time, or from stop(); then
+    the application shows b itself.
+    """
+    def __init__(self,
+                 widget: object,
+                 kind: str,
+                 a: Image.Image,
+                 b: Image.Image,
+                 size: tuple,
+                 duration: float,
+                 fps: int,
+                 show_frame,
+                 on_done=None,
+                 background: tuple=(0, 0, 0),
+                 ahead: int=3
+                 ):
+        self.widget = widget
+        self.show_frame = show_frame
+        self.on_done = on_done
+        self.duration = duration
+        self.fps = fps
+        self.count = max(1, math.ceil(duration * fps))
+        self.shown = 0
+        self.dropped = 0
+        self.running = True
+
+        self._frames = queue.Queue(maxsize=ahead)
+        self._stop = threading.Event()
+        self._next = 1
+        # a frame taken from the queue before it was due
+        self._early = None
+        self._timer = None
+        self._t0 = time.monotonic()
+        threading.Thread(target=self._make,
+                         args=(FRAMES[kind], a, b, size, background),
+                         name='transition',
+                         daemon=True).start()
+        self._timer = self.widget.after(0, self._tick)
+
+    def stop(self) -> None:
+        """End the transition now, e.g. because the next slide is due."""
+        if not self.running:
+            return
+
+        self.running = False
+        self._stop.set()
+        if self._timer is not None:
+            self.widget.after_cancel(self._timer)
+            self._timer = None
+        if self.on_done is not None:
+            self.on_done()
+
+    def stats(self) -> dict:
+        return {'frames': self.count - 1,
+                'shown': self.shown,
+                'dropped': self.dropped,
+                'seconds': min(time.monotonic() - self._t0, self.duration)}
+
+    def _due(self) -> int:
+        """Return the number of the frame that should be on screen now."""
+        return int((time.monotonic() - self._t0) * self.fps)
+
+    def _make(self, frame_fn, a, b, size, background) -> None:
+        a = compose(a, size, background)
+        b = compose(b, size, background)
+        for i in range(1, self.count):
+            if self._stop.is_set():
+                return
+            if i < self._due():
+                continue
+            frame = frame_fn(a, b, i / self.count)
+            while not self._stop.is_set():
+                try:
+                    self._frames.put((i, frame), timeout=0.05)
+                    break
+                except queue.Full:
+                    continue
+
+    def _tick(self) -> None:
+        self._timer = None
+        if not self.running:
+            return
+
+        due = self._due()
+        if due >= self.count:
+            self.dropped += max(0, self.count - self._next)
+            self.stop()
+            return
+
+        # the latest frame that is due; earlier ones are dropped
+        latest = None
+        while True:
+            if self._early is None:
+                try:
+                    self._early = self._frames.get_nowait()
+                except queue.Empty:
+                    break
+            if self._early[0] > due:
+                break
+            latest = self._early
+            self._early = None
+
+        if latest is not None:
+            i, frame = latest
+            self.dropped += i - self._next
+            self._next = i + 1
+            self.shown += 1
+            self.show_frame(frame)
+
+        wait = (self._t0 + (due + 1) / self.fps) - time.monotonic()
+        self._timer = self.widget.after(max(1, math.ceil(wait * 1000)), self._tick)
+
+
+def add_stats(totals: dict, stats: dict) -> None:
+    """Add one Transition's stats() to totals, which starts as an empty dict."""
+    totals['count'] = totals.get('count', 0) + 1
+    for key in ('frames', 'shown', 'dropped', 'seconds'):
+        totals[key] = totals.get(key, 0) + stats[key]
+
+
+def format_stats(stats: dict) -> str:
+    """Return a one-line summary of the totals made by add_stats."""
+    fps = stats['shown'] / stats['seconds'] if stats['seconds'] else 0.0
+    return (f"{stats['count']} transitions, {stats['shown']} of {stats['frames']} frames shown, "
+            f"{stats['dropped']} dropped, {fps:.1f} fps")